@@ -1,4 +1,11 @@
+import math
+import multiprocessing
 import sys
+import time
+
+# Taken before any other import, so --profile-startup can time the imports
+_START = time.perf_counter()
+
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -18,18 +25,22 @@ from PyQt6.QtWidgets import (
     QLabel,
     QHBoxLayout,
     QPlainTextEdit,
-    QToolButton
+    QToolButton,
+    QProgressDialog,
+    QCheckBox
 )
-from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtCore import Qt, QPointF, QTimer
 from PyQt6.QtGui import QPen, QColor, QPainter, QIcon, QFont
 
 from models import node, edge 
 from views.graph_scene import GraphScene
 from views.custom_graphics_view import CustomGraphicsView
-from widgets.code_editor import CodeEditor
-from widgets.metrics_panel import MetricsPanel
-from utils import exporters
+from utils import exporters, graph_io
 from utils.code_importer import GraphImporter
+from utils.worker_pool import shutdown_pool
+from utils.startup import StartupProfile
+from utils.metric_summaries import top_k, histogram, format_histogram, DEFAULT_TOP_K
+from widgets.metrics_table import COLUMNS
 
 class GraphEditor(QMainWindow):
     def __init__(self):
@@ -140,6 +151,11 @@ class GraphEditor(QMainWindow):
             ["NetworkX", "igraph", "PyVis", "Graph-tool", "PyGraphviz", "DGL", "SNAP"]
         )
         self.export_combo.currentTextChanged.connect(self.update_code_preview)
+        self.compact_check = QCheckBox("Compact")
+        self.compact_check.setToolTip(
+            "Generate bulk calls with list literals instead of one statement per node and edge"
+        )
+        self.compact_check.toggled.connect(self.update_code_preview)
 
         btn_export_clipboard = QPushButton("Copy to Clipboard")
         btn_export_clipboard.clicked.connect(
@@ -149,25 +165,25 @@ class GraphEditor(QMainWindow):
         btn_export_file.clicked.connect(lambda: self.export_graph(to_clipboard=False))
 
         export_layout.addWidget(self.export_combo)
+        export_layout.addWidget(self.compact_check)
         export_layout.addWidget(btn_export_clipboard)
         export_layout.addWidget(btn_export_file)
         right_layout.addLayout(export_layout)
 
-        # Tabs for code and metrics
+        # Tabs for code and metrics. Their contents are built the first time
+        # each tab is shown, so neither delays the first paint of the window
         self.tabs = QTabWidget()
-
-        # Code preview tab
-        self.code_editor = CodeEditor()
-        self.code_editor.codeChanged.connect(self._on_code_changed)
-        self.code_editor.importRequested.connect(self._on_import_requested)
-        self.code_editor.mode_combo.currentTextChanged.connect(
-            self._on_editor_mode_changed
-        )
-        self.tabs.addTab(self.code_editor, "Code Preview/Import")
-
-        # Metrics tab
-        self.metrics_panel = MetricsPanel(self.scene)
-        self.tabs.addTab(self.metrics_panel, "Metrics")
+        self.code_editor = None
+        self.metrics_panel = None
+        self.code_tab = QWidget()
+        self.code_tab.setLayout(QVBoxLayout())
+        self.code_tab.layout().setContentsMargins(0, 0, 0, 0)
+        self.tabs.addTab(self.code_tab, "Code Preview/Import")
+        self.metrics_tab = QWidget()
+        self.metrics_tab.setLayout(QVBoxLayout())
+        self.metrics_tab.layout().setContentsMargins(0, 0, 0, 0)
+        self.tabs.addTab(self.metrics_tab, "Metrics")
+        self.tabs.currentChanged.connect(self._create_tab)
 
         right_layout.addWidget(self.tabs)
 
@@ -180,11 +196,34 @@ class GraphEditor(QMainWindow):
 
         self.main_splitter.addWidget(right_widget)
 
-        self.scene.set_metrics_callback(self.metrics_panel.update_metrics)
+        self.main_splitter.setSizes([700, 500])
 
-        self.update_code_preview()
+        # Build the visible tab once the event loop runs, after the window is shown
+        QTimer.singleShot(0, lambda: self._create_tab(self.tabs.currentIndex()))
+
+    def _create_tab(self, index):
+        """Build the contents of the tab at ``index`` if they do not exist yet."""
+        tab = self.tabs.widget(index)
+        if tab is self.code_tab and self.code_editor is None:
+            from widgets.code_editor import CodeEditor
+
+            self.code_editor = CodeEditor()
+            self.code_editor.codeChanged.connect(self._on_code_changed)
+            self.code_editor.importRequested.connect(self._on_import_requested)
+            self.code_editor.fileImportRequested.connect(self._on_file_import_requested)
+            self.code_editor.mode_combo.currentTextChanged.connect(
+                self._on_editor_mode_changed
+            )
+            self.code_tab.layout().addWidget(self.code_editor)
+            self.update_code_preview()
+        elif tab is self.metrics_tab and self.metrics_panel is None:
+            # Importing the panel pulls in the metrics engine and its backends
+            from widgets.metrics_panel import MetricsPanel
 
-        self.main_splitter.setSizes([700, 500])
+            self.metrics_panel = MetricsPanel(self.scene)
+            self.metrics_tab.layout().addWidget(self.metrics_panel)
+            self.scene.set_metrics_callback(self.metrics_panel.update_metrics)
+            self.metrics_panel.update_metrics()
 
     def _on_code_changed(self, code):
         if self.code_editor.mode_combo.currentText() == "Preview":
@@ -195,8 +234,10 @@ class GraphEditor(QMainWindow):
         if mode == "Preview":
             self.update_code_preview()
             self.export_combo.setEnabled(True)
+            self.compact_check.setEnabled(True)
         else:
             self.export_combo.setEnabled(False)
+            self.compact_check.setEnabled(False)
 
     def _on_import_requested(self, code):
         try:
@@ -207,22 +248,23 @@ class GraphEditor(QMainWindow):
             QMessageBox.warning(self, "Import Error", str(e))
             self.code_editor.mode_combo.setCurrentText("Import")
 
+    def _on_file_import_requested(self, file_name):
+        if graph_io.format_of(file_name) is None:
+            QMessageBox.warning(self, "Import Error", f"Unsupported graph file: {file_name}")
+            return
+        try:
+            graph_io.load_graph(self.scene, file_name)
+            self.update_code_preview()
+            QMessageBox.information(self, "Success", "Graph imported successfully!")
+        except Exception as e:
+            QMessageBox.warning(self, "Import Error", str(e))
+
     def update_code_preview(self):
-        library = self.export_combo.currentText()
-        if library == "NetworkX":
-            code = exporters.export_networkx(self.scene)
-        elif library == "igraph":
-            code = exporters.export_igraph(self.scene)
-        elif library == "PyVis":
-            code = exporters.export_pyvis(self.scene)
-        elif library == "PyGraphviz":
-            code = exporters.export_pygraphviz(self.scene)
-        elif library == "Graph-tool":
-            code = exporters.export_graphtool(self.scene)
-        elif library == "DGL":
-            code = exporters.export_dgl(self.scene)
-        elif library == "SNAP":
-            code = exporters.export_snap(self.scene)
+        if self.code_editor is None:
+            # Generated when the code tab is first shown
+            return
+        code = exporters.export_code(
+            self.export_combo.currentText(), self.scene, self.compact_check.isChecked())
 
         self.code_editor.setPlainText(code)
 
@@ -248,8 +290,9 @@ class GraphEditor(QMainWindow):
 
     def export_graph(self, to_clipboard=True):
         current_tab = self.tabs.currentWidget()
+        self._create_tab(self.tabs.currentIndex())
 
-        if isinstance(current_tab, CodeEditor):
+        if current_tab is self.code_tab:
             code = self.code_editor.toPlainText()
             if to_clipboard:
                 clipboard = QApplication.clipboard()
@@ -260,16 +303,25 @@ class GraphEditor(QMainWindow):
                     self,
                     "Save Code",
                     f"graph_{self.export_combo.currentText().lower()}.py",
-                    "Python files (*.py);;All Files (*.*)",
+                    "Python files (*.py);;Compressed Python files (*.py.gz);;"
+                    + ";;".join(graph_io.FILE_FILTERS.values())
+                    + ";;All Files (*.*)",
                 )
-                if file_name:
-                    with open(file_name, "w") as f:
-                        f.write(code)
+                if file_name and graph_io.format_of(file_name) is not None:
+                    # Graph formats store the graph itself rather than code
+                    try:
+                        graph_io.save_graph(self.scene, file_name)
+                        QMessageBox.information(
+                            self, "Success", f"Graph saved to {file_name}"
+                        )
+                    except (OSError, ImportError) as e:
+                        QMessageBox.warning(self, "Export Error", str(e))
+                elif file_name and self.save_export(file_name):
                     QMessageBox.information(
                         self, "Success", f"Code saved to {file_name}"
                     )
 
-        elif isinstance(current_tab, MetricsPanel):
+        elif current_tab is self.metrics_tab:
             metrics_text = self.get_metrics_text()
             if to_clipboard:
                 clipboard = QApplication.clipboard()
@@ -289,13 +341,51 @@ class GraphEditor(QMainWindow):
                         self, "Success", f"Metrics saved to {file_name}"
                     )
 
+    def save_export(self, file_name):
+        """Save the code tab to ``file_name``.
+
+        In Preview mode the export is streamed straight from the graph; in
+        Import mode the code typed or pasted into the editor is saved as is.
+        """
+        if self.code_editor.mode_combo.currentText() != "Preview":
+            try:
+                return exporters.write_export([self.code_editor.toPlainText()], file_name)
+            except OSError as e:
+                QMessageBox.warning(self, "Export Error", str(e))
+                return False
+
+        library = self.export_combo.currentText()
+        compact = self.compact_check.isChecked()
+        total = exporters.export_chunk_count(library, self.scene, compact)
+        progress = QProgressDialog(f"Exporting {library} code\u2026", "Cancel", 0, total, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(500)
+
+        def report(count):
+            progress.setValue(min(count, total))
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+
+        try:
+            completed = exporters.write_export(
+                exporters.EXPORTERS[library][0](self.scene, compact), file_name, report)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Error", str(e))
+            completed = False
+        finally:
+            progress.close()
+        return completed
+
     def get_metrics_text(self):
+        from utils.component_distances import component_distances, component_summary
+
         metrics = []
         metrics.append("Graph Metrics Report")
         metrics.append("===================\n")
 
-        num_nodes = len(self.scene.nodes)
-        num_edges = sum(len(node.edges) for node in self.scene.nodes.values()) // 2
+        snapshot = self.scene.graph.snapshot()
+        num_nodes = snapshot.num_nodes
+        num_edges = snapshot.num_edges
 
         metrics.append(f"Number of nodes: {num_nodes}")
         metrics.append(f"Number of edges: {num_edges}")
@@ -307,17 +397,63 @@ class GraphEditor(QMainWindow):
         if num_nodes > 0:
             avg_degree = (2 * num_edges) / num_nodes
             metrics.append(f"Average degree: {avg_degree:.2f}")
+            metrics.append(f"Connected components: {self.scene.graph.number_of_components()}")
+            metrics.append(f"Average clustering: {self.scene.graph.average_clustering():.3f}")
+
+        if num_nodes > 0:
+            # Reuse the panel's result when it describes the current graph
+            cached = self.metrics_panel.component_distances
+            if cached is not None and cached[0] == snapshot.topology_key:
+                distances = cached[1]
+            else:
+                distances = component_distances(snapshot)
+            metrics.append("\nDistance Metrics (per connected component, largest first):")
+            for i, extrema in enumerate(distances, start=1):
+                metrics.append(f"{i}. {component_summary(extrema)}")
+
+        # Centralities come from the panel when they describe the current graph
+        table = self.metrics_panel.table_model
+        current = self.metrics_panel.submitted_topology == snapshot.topology_key
+        for name, title in COLUMNS[1:]:
+            values = snapshot.degrees if name == "degree" else table.values(name) if current else None
+            if not num_nodes or values is None or all(math.isnan(value) for value in values):
+                # All NaN after a failed computation
+                continue
+            precision = 0 if name == "degree" else 3
+            metrics.append(f"\nTop {DEFAULT_TOP_K} Nodes by {title}:")
+            for node_id, value in top_k(snapshot.nodes, values):
+                metrics.append(f"{node_id}: {value:.{precision}f}")
+            metrics.append(f"\n{title} Distribution:")
+            metrics.extend(format_histogram(*histogram(values, discrete=name == "degree"), name == "degree"))
 
         metrics.append("\nNode Degrees:")
-        for node_id, node in self.scene.nodes.items():
-            degree = len(node.edges)
+        for node_id, degree in zip(snapshot.nodes, snapshot.degrees):
             metrics.append(f"{node_id}: {degree}")
 
         return "\n".join(metrics)
 
 
 if __name__ == "__main__":
+    # Metric workers are spawned by re-running the frozen executable
+    multiprocessing.freeze_support()
+    profile = StartupProfile(_START) if "--profile-startup" in sys.argv else None
+    if profile:
+        sys.argv.remove("--profile-startup")
+        profile.mark("imports")
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(shutdown_pool)
+    if profile:
+        profile.mark("QApplication")
     window = GraphEditor()
+    if profile:
+        profile.mark("main window")
     window.show()
+    if profile:
+        # Showing only posts the paint events; paint now, before the deferred
+        # tab is built, to time the first paint on its own
+        window.repaint()
+        profile.mark("first paint")
+        window._create_tab(window.tabs.currentIndex())
+        profile.mark("visible tab")
+        profile.report()
     sys.exit(app.exec())
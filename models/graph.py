@@ -0,0 +1,424 @@
+from bisect import bisect_left, insort
+from collections.abc import Sequence, Set
+from operator import neg
+
+
+class _SetView(Set):
+    """Read-only view of a set; later changes to the set show through."""
+    __slots__ = ("_items",)
+
+    def __init__(self, items):
+        self._items = items
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class _SequenceView(Sequence):
+    """Read-only view of a list; later changes to the list show through."""
+    __slots__ = ("_items",)
+
+    def __init__(self, items):
+        self._items = items
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self):
+        return len(self._items)
+
+
+class GraphSnapshot:
+    """Immutable view of the graph structure at a given version.
+
+    Safe to hand to worker threads: it only holds tuples of node ids and
+    undirected edges, never the scene's model objects.
+    """
+    __slots__ = ("version", "topology_key", "nodes", "edges", "degrees", "components", "_adjacency")
+
+    def __init__(self, version, topology_key, nodes, edges, degrees, components):
+        self.version = version
+        self.topology_key = topology_key  # Equal for snapshots with the same nodes and edges
+        self.nodes = nodes  # tuple of node ids, in insertion order
+        self.edges = edges  # tuple of (source id, target id), one per connected pair
+        self.degrees = degrees  # tuple of degrees aligned with nodes
+        self.components = components  # tuple of node id tuples, largest component first
+        self._adjacency = None
+
+    @property
+    def num_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def num_edges(self):
+        return sum(self.degrees) // 2
+
+    @property
+    def is_connected(self):
+        return len(self.components) == 1
+
+    @property
+    def adjacency(self):
+        """Mapping of node id to a tuple of its distinct neighbors."""
+        if self._adjacency is None:
+            adjacency = {node_id: [] for node_id in self.nodes}
+            for source, target in self.edges:
+                adjacency[source].append(target)
+                adjacency[target].append(source)
+            self._adjacency = {node_id: tuple(nbrs) for node_id, nbrs in adjacency.items()}
+        return self._adjacency
+
+
+class GraphModel:
+    """Canonical undirected graph structure kept in sync by GraphScene.
+
+    Parallel edges between the same pair of nodes are counted in the degrees
+    and the edge count, but the pair appears only once in edges().
+
+    Connected components are maintained incrementally: inserting an edge
+    merges the smaller component into the larger one, and deleting the last
+    edge between two nodes runs a bidirectional search that stops as soon as
+    the endpoints meet or the smaller side runs out, splitting that side off.
+
+    Triangle counts are maintained the same way: a new or vanished pair only
+    affects the triangles through its common neighbors, found by scanning the
+    smaller of the two neighbor sets. Self-loops and parallel edges are
+    ignored for clustering, as in NetworkX.
+    """
+    def __init__(self):
+        self._adjacency = {}  # node id -> {neighbor id: number of parallel edges}
+        self._edges = {}  # sorted id pair -> (source id, target id), in insertion order
+        self._degrees = {}  # node id -> degree, counting parallel edges
+        self._num_edges = 0
+        self._component_of = {}  # node id -> component id
+        self._components = {}  # component id -> set of node ids
+        self._next_component = 0
+        self._sizes = []  # Component sizes, largest first
+        self._triangles = {}  # node id -> number of triangles through the node
+        self._clustering_sum = 0.0  # Sum of the local clustering coefficients
+        self._version = 0
+        self._snapshot = None
+        # Order-independent hash of the node and edge sets, updated in O(1)
+        # per change so that returning to an earlier topology restores its key
+        self._structure_hash = 0
+
+    @property
+    def version(self):
+        """Structural version, bumped on every node or edge change."""
+        return self._version
+
+    @property
+    def topology_key(self):
+        """Hashable key identifying the current node and edge sets."""
+        return (self._structure_hash, len(self._adjacency), len(self._edges))
+
+    def _touch(self):
+        self._version += 1
+        self._snapshot = None
+
+    def add_node(self, node_id):
+        if node_id in self._adjacency:
+            return
+        self._adjacency[node_id] = {}
+        self._degrees[node_id] = 0
+        self._triangles[node_id] = 0
+        self._new_component({node_id})
+        self._resize_component(0, 1)
+        self._structure_hash ^= hash(("node", node_id))
+        self._touch()
+
+    def remove_node(self, node_id):
+        neighbors = list(self._adjacency[node_id])
+        for neighbor_id, count in list(self._adjacency[node_id].items()):
+            for _ in range(count):
+                self._detach(node_id, neighbor_id)
+        del self._adjacency[node_id]
+        del self._degrees[node_id]
+        del self._triangles[node_id]
+        component = self._component_of.pop(node_id)
+        self._resize_component(len(self._components[component]), len(self._components[component]) - 1)
+        self._components[component].discard(node_id)
+        if not self._components[component]:
+            del self._components[component]
+
+        # The former neighbors may now be spread over several components;
+        # check each against the others that still share its component
+        while neighbors:
+            first = neighbors.pop()
+            neighbors = [
+                other for other in neighbors
+                if self._component_of[other] != self._component_of[first]
+                or not self._split_if_disconnected(first, other)
+            ]
+        self._structure_hash ^= hash(("node", node_id))
+        self._touch()
+
+    def add_edge(self, source_id, target_id):
+        key = _edge_key(source_id, target_id)
+        count = self._adjacency[source_id].get(target_id, 0)
+        if count == 0:
+            self._update_triangles(source_id, target_id, 1)
+        self._adjacency[source_id][target_id] = count + 1
+        self._adjacency[target_id][source_id] = count + 1
+        if count == 0:
+            self._edges[key] = (source_id, target_id)
+            self._structure_hash ^= hash(key)
+            self._merge_components(source_id, target_id)
+        self._degrees[source_id] += 1
+        self._degrees[target_id] += 1
+        self._num_edges += 1
+        self._touch()
+
+    def remove_edge(self, source_id, target_id):
+        if self._detach(source_id, target_id):
+            self._split_if_disconnected(source_id, target_id)
+
+    def _detach(self, source_id, target_id):
+        """Remove one edge without updating components; True if the pair is no longer adjacent."""
+        count = self._adjacency[source_id].get(target_id, 0)
+        if count == 0:
+            return False
+        if count == 1:
+            del self._adjacency[source_id][target_id]
+            del self._adjacency[target_id][source_id]
+            self._update_triangles(source_id, target_id, -1)
+            key = _edge_key(source_id, target_id)
+            del self._edges[key]
+            self._structure_hash ^= hash(key)
+        else:
+            self._adjacency[source_id][target_id] = count - 1
+            self._adjacency[target_id][source_id] = count - 1
+        self._degrees[source_id] -= 1
+        self._degrees[target_id] -= 1
+        self._num_edges -= 1
+        self._touch()
+        return count == 1
+
+    def _local_clustering(self, node_id, extra_degree=0):
+        neighbors = self._adjacency[node_id]
+        degree = len(neighbors) - (node_id in neighbors) + extra_degree
+        return 2 * self._triangles[node_id] / (degree * (degree - 1)) if degree > 1 else 0.0
+
+    def _update_triangles(self, source_id, target_id, sign):
+        """Account for the pair (source, target) appearing (+1) or disappearing (-1).
+
+        Must be called while the pair is absent from the adjacency, just
+        before it is inserted or just after it is deleted.
+        """
+        if source_id == target_id:
+            return
+        smaller, larger = self._adjacency[source_id], self._adjacency[target_id]
+        if len(smaller) > len(larger):
+            smaller, larger = larger, smaller
+        common = [node_id for node_id in smaller
+                  if node_id in larger and node_id != source_id and node_id != target_id]
+
+        was_present = sign < 0
+        self._clustering_sum -= (
+            self._local_clustering(source_id, was_present) + self._local_clustering(target_id, was_present)
+            + sum(self._local_clustering(node_id) for node_id in common)
+        )
+        self._triangles[source_id] += sign * len(common)
+        self._triangles[target_id] += sign * len(common)
+        for node_id in common:
+            self._triangles[node_id] += sign
+        self._clustering_sum += (
+            self._local_clustering(source_id, not was_present) + self._local_clustering(target_id, not was_present)
+            + sum(self._local_clustering(node_id) for node_id in common)
+        )
+
+    def _new_component(self, members):
+        component = self._next_component
+        self._next_component += 1
+        self._components[component] = members
+        for node_id in members:
+            self._component_of[node_id] = component
+
+    def _resize_component(self, old, new):
+        """Replace a component size ``old`` by ``new`` in the sorted sizes; 0 stands for no component."""
+        if old:
+            del self._sizes[bisect_left(self._sizes, -old, key=neg)]
+        if new:
+            insort(self._sizes, new, key=neg)
+
+    def _merge_components(self, source_id, target_id):
+        kept = self._component_of[source_id]
+        merged = self._component_of[target_id]
+        if kept == merged:
+            return
+        if len(self._components[kept]) < len(self._components[merged]):
+            kept, merged = merged, kept
+        members = self._components.pop(merged)
+        self._resize_component(len(members), 0)
+        self._resize_component(len(self._components[kept]), len(self._components[kept]) + len(members))
+        for node_id in members:
+            self._component_of[node_id] = kept
+        self._components[kept] |= members
+
+    def _split_if_disconnected(self, source_id, target_id):
+        """Split the component of two nodes if no path joins them any more.
+
+        Both searches advance one node at a time on whichever side has seen
+        fewer nodes, so the cost is bounded by the smaller resulting component
+        when a split happens. Returns True if the nodes are still connected.
+        """
+        sides = [({source_id}, [source_id]), ({target_id}, [target_id])]
+        while True:
+            side = 0 if len(sides[0][0]) <= len(sides[1][0]) else 1
+            seen, queue = sides[side]
+            other_seen = sides[1 - side][0]
+            if not queue:
+                break
+            node_id = queue.pop()
+            for neighbor_id in self._adjacency[node_id]:
+                if neighbor_id in other_seen:
+                    return True
+                if neighbor_id not in seen:
+                    seen.add(neighbor_id)
+                    queue.append(neighbor_id)
+
+        # This side is exhausted, so it is a complete component of its own
+        remaining = self._components[self._component_of[source_id]]
+        self._resize_component(len(remaining), len(remaining) - len(seen))
+        remaining -= seen
+        self._new_component(seen)
+        self._resize_component(0, len(seen))
+        return False
+
+    def load(self, node_ids, edges):
+        """Replace the graph with ``node_ids`` and ``edges`` (pairs of node ids).
+
+        Produces the same state as adding them one by one, but finds the
+        components with one search per component and counts the triangles in
+        one pass over the edges, each oriented towards its higher-degree end.
+        """
+        self.clear()
+        adjacency = self._adjacency
+        for node_id in node_ids:
+            if node_id not in adjacency:
+                adjacency[node_id] = {}
+                self._structure_hash ^= hash(("node", node_id))
+        for source_id, target_id in edges:
+            count = adjacency[source_id].get(target_id, 0)
+            adjacency[source_id][target_id] = count + 1
+            adjacency[target_id][source_id] = count + 1
+            if count == 0:
+                key = _edge_key(source_id, target_id)
+                self._edges[key] = (source_id, target_id)
+                self._structure_hash ^= hash(key)
+            self._num_edges += 1
+        self._degrees = {node_id: sum(neighbors.values()) for node_id, neighbors in adjacency.items()}
+
+        for node_id in adjacency:
+            if node_id not in self._component_of:
+                members = {node_id}
+                queue = [node_id]
+                while queue:
+                    for neighbor_id in adjacency[queue.pop()]:
+                        if neighbor_id not in members:
+                            members.add(neighbor_id)
+                            queue.append(neighbor_id)
+                self._new_component(members)
+        self._sizes.extend(sorted(map(len, self._components.values()), reverse=True))
+
+        # Each triangle is found once, from its lowest-ranked node
+        rank = {node_id: (len(neighbors), i) for i, (node_id, neighbors) in enumerate(adjacency.items())}
+        higher = {
+            node_id: {neighbor_id for neighbor_id in neighbors if rank[neighbor_id] > rank[node_id]}
+            for node_id, neighbors in adjacency.items()
+        }
+        self._triangles = dict.fromkeys(adjacency, 0)
+        for node_id, up in higher.items():
+            for neighbor_id in up:
+                for third_id in up & higher[neighbor_id]:
+                    self._triangles[node_id] += 1
+                    self._triangles[neighbor_id] += 1
+                    self._triangles[third_id] += 1
+        self._clustering_sum = sum(self._local_clustering(node_id) for node_id in adjacency)
+        self._touch()
+
+    def clear(self):
+        self._adjacency.clear()
+        self._edges.clear()
+        self._degrees.clear()
+        self._component_of.clear()
+        self._components.clear()
+        self._sizes.clear()
+        self._triangles.clear()
+        self._clustering_sum = 0.0
+        self._num_edges = 0
+        self._structure_hash = 0
+        self._touch()
+
+    def number_of_nodes(self):
+        return len(self._adjacency)
+
+    def number_of_edges(self):
+        return self._num_edges
+
+    def degree(self, node_id):
+        return self._degrees[node_id]
+
+    def neighbors(self, node_id):
+        return self._adjacency[node_id].keys()
+
+    def has_edge(self, source_id, target_id):
+        return target_id in self._adjacency.get(source_id, ())
+
+    def triangles(self, node_id):
+        return self._triangles[node_id]
+
+    def local_clustering(self, node_id):
+        return self._local_clustering(node_id)
+
+    def average_clustering(self):
+        """Mean local clustering coefficient over all nodes, like nx.average_clustering."""
+        if not self._adjacency:
+            return 0.0
+        # Clamp the rounding drift of the running sum
+        return max(0.0, self._clustering_sum / len(self._adjacency))
+
+    def number_of_components(self):
+        return len(self._components)
+
+    def is_connected(self):
+        return len(self._components) == 1
+
+    def component_of(self, node_id):
+        """Identifier of the component holding ``node_id``, stable until that component changes."""
+        return self._component_of[node_id]
+
+    def component_size(self, node_id):
+        return len(self._components[self._component_of[node_id]])
+
+    def component_members(self, node_id):
+        """Read-only view of the nodes in the same component as ``node_id``, valid until that component changes."""
+        return _SetView(self._components[self._component_of[node_id]])
+
+    def component_sizes(self):
+        """Read-only view of the sizes of all components, largest first, kept up to date."""
+        return _SequenceView(self._sizes)
+
+    def snapshot(self):
+        """Return a read-only GraphSnapshot, cached until the next change."""
+        if self._snapshot is None:
+            nodes = tuple(self._adjacency)
+            self._snapshot = GraphSnapshot(
+                self._version,
+                self.topology_key,
+                nodes,
+                tuple(self._edges.values()),
+                tuple(self._degrees[node_id] for node_id in nodes),
+                tuple(sorted((tuple(members) for members in self._components.values()), key=len, reverse=True)),
+            )
+        return self._snapshot
+
+
+def _edge_key(source_id, target_id):
+    return (source_id, target_id) if source_id <= target_id else (target_id, source_id)
@@ -7,6 +7,5 @@ class Node:
         self.pos = pos
         self.edges = []
         self.graphics_item = None
-        self.text_item = None
         self.radius = 20
         self.color = QColor(174, 34, 255)
\ No newline at end of file
@@ -0,0 +1,37 @@
+import pytest
+from PyQt6.QtCore import QPointF
+
+from utils import graph_io
+
+
+def _graph(scene):
+    """Node ids with positions, and edges as sorted id pairs."""
+    nodes = [(node.id, node.pos.x(), node.pos.y()) for node in scene.nodes.values()]
+    edges = sorted(tuple(sorted(edge)) for edge in graph_io._scene_edges(scene))
+    return nodes, edges
+
+
+@pytest.mark.parametrize("name", ["graph.edgelist", "graph.edges.gz", "graph.graphml", "graph.npz"])
+def test_round_trip_keeps_node_ids(app, tmp_path, name):
+    from views.graph_scene import GraphScene
+
+    if name.endswith(".npz"):
+        pytest.importorskip("numpy")
+    scene = GraphScene()
+    nodes = [scene.add_node(QPointF(i * 10, i)) for i in range(6)]
+    scene.add_edge(nodes[0], nodes[1])
+    scene.add_edge(nodes[1], nodes[4])
+    # n2, n3 and n5 are isolated
+    expected = _graph(scene)
+
+    file_name = str(tmp_path / name)
+    graph_io.save_graph(scene, file_name)
+    loaded = GraphScene()
+    graph_io.load_graph(loaded, file_name)
+    nodes, edges = _graph(loaded)
+    assert edges == expected[1]
+    if name.startswith("graph.edge"):
+        # Edge lists carry no positions
+        assert [node_id for node_id, _, _ in nodes] == [node_id for node_id, _, _ in expected[0]]
+    else:
+        assert nodes == expected[0]
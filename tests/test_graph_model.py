@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from models.graph import GraphModel
+
+
+def _sizes(model):
+    return sorted((len(members) for members in model._components.values()), reverse=True)
+
+
+def test_component_sizes_follow_edits():
+    rng = random.Random(0)
+    model = GraphModel()
+    sizes = model.component_sizes()
+    node_ids = []
+    for step in range(2000):
+        action = rng.random()
+        if action < 0.2 or len(node_ids) < 2:
+            node_ids.append(f"n{step}")
+            model.add_node(node_ids[-1])
+        elif action < 0.6:
+            model.add_edge(*rng.sample(node_ids, 2))
+        elif action < 0.9 and model.number_of_edges():
+            model.remove_edge(*rng.choice(model.snapshot().edges))
+        else:
+            node_id = node_ids.pop(rng.randrange(len(node_ids)))
+            model.remove_node(node_id)
+        assert list(sizes) == _sizes(model)
+
+    model.load(node_ids, model.snapshot().edges)
+    assert list(sizes) == _sizes(model)
+
+
+def test_component_members_is_read_only():
+    model = GraphModel()
+    model.load(["a", "b", "c"], [("a", "b")])
+    members = model.component_members("a")
+    assert members == {"a", "b"}
+    with pytest.raises(AttributeError):
+        members.add("c")
@@ -0,0 +1,15 @@
+import math
+
+from utils.metric_summaries import histogram, top_k
+
+
+def test_top_k_skips_nan():
+    assert top_k(["a", "b", "c"], [math.nan, 2.0, 1.0], k=2) == [("b", 2.0), ("c", 1.0)]
+    assert top_k(["a", "b"], [math.nan, math.nan]) == []
+
+
+def test_histogram_skips_nan():
+    edges, counts = histogram([0.0, math.nan, 1.0], bins=2)
+    assert edges == [0.0, 0.5, 1.0]
+    assert counts == [1, 1]
+    assert histogram([math.nan, math.nan]) == ([], [])
@@ -0,0 +1,15 @@
+import sys
+
+from utils import metrics_backends
+
+
+def test_backend_with_broken_import_is_skipped(monkeypatch):
+    # A None entry makes "import igraph" raise ImportError, as a broken install would
+    monkeypatch.setitem(sys.modules, "igraph", None)
+    metrics_backends._importable.cache_clear()
+    try:
+        assert not metrics_backends.IGraphBackend.available()
+        cls = metrics_backends.select_backend("eigenvector_centrality", 10, preferred="igraph")
+        assert cls is not metrics_backends.IGraphBackend
+    finally:
+        metrics_backends._importable.cache_clear()
@@ -0,0 +1,30 @@
+from PyQt6.QtCore import QPointF
+
+import utils.metrics_engine
+from conftest import wait_until
+
+
+def _fail(*args, **kwargs):
+    yield "sampling", None
+    raise RuntimeError("backend broken")
+
+
+def test_failed_job_leaves_metrics_report_usable(app, monkeypatch):
+    from main import GraphEditor
+
+    monkeypatch.setattr(utils.metrics_engine, "compute_metrics", _fail)
+    window = GraphEditor()
+    window.tabs.setCurrentWidget(window.metrics_tab)
+    window._create_tab(window.tabs.currentIndex())
+    panel = window.metrics_panel
+    a = window.scene.add_node(QPointF(0, 0))
+    b = window.scene.add_node(QPointF(50, 0))
+    window.scene.add_edge(a, b)
+    window.scene.flush_refresh()
+
+    assert wait_until(app, lambda: "failed" in panel.diameter_label.text())
+    assert panel.table_model.data(panel.table_model.index(0, 3)) == "N/A"
+    report = window.get_metrics_text()
+    assert "Top 10 Nodes by Degree:" in report
+    assert "Betweenness" not in report
+    window.close()
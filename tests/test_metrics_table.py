@@ -0,0 +1,10 @@
+from PyQt6.QtCore import Qt
+
+from widgets.metrics_table import MetricsTableModel
+
+
+def test_node_column_sorts_numerically(app):
+    model = MetricsTableModel()
+    model.set_nodes(("n10", "n2", "n1", "n100"), (0, 0, 0, 0))
+    model.sort(0, Qt.SortOrder.AscendingOrder)
+    assert [model.data(model.index(row, 0)) for row in range(model.rowCount())] == ["n1", "n2", "n10", "n100"]
@@ -1,49 +1,33 @@
-import ast, re
+import ast, importlib, importlib.util, math, re
 from PyQt6.QtCore import QPointF
-
-AVAILABLE_LIBRARIES = {}
-
-try:
-    import networkx as nx
-    AVAILABLE_LIBRARIES['networkx'] = nx
-except ImportError:
-    pass
-
-try:
-    import graph_tool.all as gt
-    AVAILABLE_LIBRARIES['graph-tool'] = gt
-except ImportError:
-    pass
-
-try:
-    import igraph as ig
-    AVAILABLE_LIBRARIES['igraph'] = ig
-except ImportError:
-    pass
-
-try:
-    from pyvis.network import Network
-    AVAILABLE_LIBRARIES['pyvis'] = Network
-except ImportError:
-    pass
-
-try:
-    import pygraphviz as pgv
-    AVAILABLE_LIBRARIES['pygraphviz'] = pgv
-except ImportError:
-    pass
-
-try:
-    import dgl
-    AVAILABLE_LIBRARIES['dgl'] = dgl
-except ImportError:
-    pass
-
-try:
-    import snap
-    AVAILABLE_LIBRARIES['snap'] = snap
-except ImportError:
-    pass
+from utils.static_importer import extract_graph
+
+# Library name -> module providing it. Availability is checked with
+# find_spec(), which does not run the module; the module itself is imported
+# by load_library() when an import first needs it
+LIBRARY_MODULES = {
+    'networkx': 'networkx',
+    'graph-tool': 'graph_tool.all',
+    'igraph': 'igraph',
+    'pyvis': 'pyvis.network',
+    'pygraphviz': 'pygraphviz',
+    'dgl': 'dgl',
+    'snap': 'snap',
+}
+
+def _installed(module):
+    try:
+        return importlib.util.find_spec(module.split('.')[0]) is not None
+    except ValueError:
+        return False
+
+AVAILABLE_LIBRARIES = {name: module for name, module in LIBRARY_MODULES.items() if _installed(module)}
+
+def load_library(name):
+    """Import the module for ``name`` on first use; later calls hit sys.modules."""
+    if name not in AVAILABLE_LIBRARIES:
+        raise ImportError(f"{name} is not installed")
+    return importlib.import_module(AVAILABLE_LIBRARIES[name])
 
 class GraphImporter:
     @staticmethod
@@ -51,46 +35,68 @@ class GraphImporter:
         """Import a graph from Python code into the scene"""
         try:
             tree = ast.parse(code)
-            scene.clear_all()
-
-            if "networkx" in code:
-                if 'networkx' not in AVAILABLE_LIBRARIES:
-                    raise ImportError("NetworkX is not installed. Please install it with 'pip install networkx'")
-                GraphImporter._import_networkx(code, scene)
-            elif "graph_tool" in code or "graph-tool" in code:
-                if 'graph-tool' not in AVAILABLE_LIBRARIES:
-                    raise ImportError("graph-tool is not installed. Please install it with your system package manager or conda")
-                GraphImporter._import_graphtool(code, scene)
-            elif "igraph" in code:
-                if 'igraph' not in AVAILABLE_LIBRARIES:
-                    raise ImportError("igraph is not installed. Please install it with 'pip install python-igraph'")
-                GraphImporter._import_igraph(code, scene)
-            elif "pyvis" in code:
-                if 'pyvis' not in AVAILABLE_LIBRARIES:
-                    raise ImportError("PyVis is not installed. Please install it with 'pip install pyvis'")
-                GraphImporter._import_pyvis(code, scene)
-            elif "pygraphviz" in code:
-                if 'pygraphviz' not in AVAILABLE_LIBRARIES:
-                    raise ImportError("PyGraphviz is not installed. Please install it with 'pip install pygraphviz'")
-                GraphImporter._import_pygraphviz(code, scene)
-            else:
-                raise ValueError("No supported graph library found in code. Supported libraries: " + ", ".join(AVAILABLE_LIBRARIES.keys()))
+            # Code shaped like our exports is read without running it; only
+            # code that needs a library to lay out or build the graph is run
+            graph = extract_graph(tree)
+            with scene.batch():
+                scene.clear_all()
+
+                if graph is not None and (graph.positions() is not None or not GraphImporter._runnable(code)):
+                    GraphImporter._import_static(graph, scene)
+                elif "networkx" in code:
+                    if 'networkx' not in AVAILABLE_LIBRARIES:
+                        raise ImportError("NetworkX is not installed. Please install it with 'pip install networkx'")
+                    GraphImporter._import_networkx(code, scene)
+                elif "graph_tool" in code or "graph-tool" in code:
+                    if 'graph-tool' not in AVAILABLE_LIBRARIES:
+                        raise ImportError("graph-tool is not installed. Please install it with your system package manager or conda")
+                    GraphImporter._import_graphtool(code, scene)
+                elif "igraph" in code:
+                    if 'igraph' not in AVAILABLE_LIBRARIES:
+                        raise ImportError("igraph is not installed. Please install it with 'pip install python-igraph'")
+                    GraphImporter._import_igraph(code, scene)
+                elif "pyvis" in code:
+                    if 'pyvis' not in AVAILABLE_LIBRARIES:
+                        raise ImportError("PyVis is not installed. Please install it with 'pip install pyvis'")
+                    GraphImporter._import_pyvis(code, scene)
+                elif "pygraphviz" in code:
+                    if 'pygraphviz' not in AVAILABLE_LIBRARIES:
+                        raise ImportError("PyGraphviz is not installed. Please install it with 'pip install pygraphviz'")
+                    GraphImporter._import_pygraphviz(code, scene)
+                else:
+                    raise ValueError("No supported graph library found in code. Supported libraries: " + ", ".join(AVAILABLE_LIBRARIES.keys()))
             
             return True
         except Exception as e:
             raise ValueError(f"Error importing graph: {str(e)}")
     
+    @staticmethod
+    def _runnable(code):
+        """Whether the code uses a library with an exec-based importer."""
+        return any(lib in code for lib in ("networkx", "graph_tool", "graph-tool", "igraph", "pyvis", "pygraphviz"))
+
+    @staticmethod
+    def _import_static(graph, scene):
+        """Add a graph read by extract_graph(), on a grid if it has no positions"""
+        positions = graph.positions()
+        if positions is None:
+            columns = max(1, math.ceil(math.sqrt(len(graph.nodes))))
+            positions = [(i % columns * 60, i // columns * 60) for i in range(len(graph.nodes))]
+        scene.bulk_load([QPointF(x, y) for x, y in positions], graph.index_edges())
+        return True
+
     @staticmethod
     def _import_networkx(code, scene):
         """Import from NetworkX code"""
         if 'networkx' not in AVAILABLE_LIBRARIES:
             raise ImportError("NetworkX is not installed")
             
+        nx = load_library('networkx')
         G = nx.Graph()
         
         globals_dict = {
-            "nx": AVAILABLE_LIBRARIES['networkx'],
-            "networkx": AVAILABLE_LIBRARIES['networkx'],
+            "nx": nx,
+            "networkx": nx,
             "G": G
         }
         locals_dict = {}
@@ -108,39 +114,42 @@ class GraphImporter:
             pos = nx.spring_layout(G)
         
         node_map = {}
+        positions = []
         for node in G.nodes():
             try:
                 if node in pos:
                     x, y = pos[node]
-                    scene_pos = QPointF(float(x), float(y))
-                    scene_node = scene.add_node(scene_pos)
-                    node_map[node] = scene_node
+                    node_map[node] = len(positions)
+                    positions.append(QPointF(float(x), float(y)))
             except Exception as e:
                 raise ValueError(f"Error adding node '{node}': {str(e)}")
         
         # Add edges
+        edges = []
         for edge in G.edges():
             try:
                 source, target = edge
                 if source in node_map and target in node_map:
-                    scene.add_edge(node_map[source], node_map[target])
+                    edges.append((node_map[source], node_map[target]))
             except Exception as e:
                 raise ValueError(f"Error adding edge {edge}: {str(e)}")
-                    
+
+        scene.bulk_load(positions, edges)
         return True
     
     @staticmethod
     def _import_graphtool(code, scene):
         """Import from graph-tool code"""
         try:
+            gt = load_library('graph-tool')
             g = gt.Graph()
             name = g.new_vertex_property('string')
             pos = g.new_vertex_property('vector<double>')
             vertices = {}
             
             globals_dict = {
-                "graph_tool": AVAILABLE_LIBRARIES['graph-tool'],
-                "gt": AVAILABLE_LIBRARIES['graph-tool'],
+                "graph_tool": gt,
+                "gt": gt,
                 "Graph": gt.Graph,
                 "vector": gt.vector
             }
@@ -156,23 +165,26 @@ class GraphImporter:
             g = locals_dict.get("g", g)
             pos = locals_dict.get("pos", pos)
             
-            vertex_list = []
+            positions = []
             for v in g.vertices():
                 try:
                     x, y = pos[v][0], pos[v][1]
-                    scene_pos = QPointF(float(x), float(y))
-                    node = scene.add_node(scene_pos)
-                    vertex_list.append(node)
+                    positions.append(QPointF(float(x), float(y)))
                 except Exception as e:
                     raise ValueError(f"Error processing vertex {v}: {str(e)}")
             
+            edges = []
             for e in g.edges():
                 try:
                     source_idx = int(e.source())
                     target_idx = int(e.target())
-                    scene.add_edge(vertex_list[source_idx], vertex_list[target_idx])
+                    if source_idx >= len(positions) or target_idx >= len(positions):
+                        raise IndexError("vertex index out of range")
+                    edges.append((source_idx, target_idx))
                 except Exception as e:
                     raise ValueError(f"Error processing edge {e}: {str(e)}")
+
+            scene.bulk_load(positions, edges)
                 
         except Exception as e:
             raise ValueError(f"Error importing graph-tool graph: {str(e)}")
@@ -183,7 +195,7 @@ class GraphImporter:
         if 'igraph' not in AVAILABLE_LIBRARIES:
             raise ImportError("igraph is not installed. Please install it with 'pip install python-igraph'")
         
-        ig = AVAILABLE_LIBRARIES['igraph']
+        ig = load_library('igraph')
         
         globals_dict = {
             "igraph": ig,
@@ -230,20 +242,16 @@ class GraphImporter:
         if len(node_positions) != graph.vcount():
             raise ValueError("Layout dimension does not match the number of vertices in the graph.")
 
-        node_map = {}
-        for idx in range(graph.vcount()):
-            pos = node_positions[idx]
-            scene_node = scene.add_node(pos)
-            node_map[idx] = scene_node
-
+        edges = []
         for edge in graph.es:
             source = edge.source
             target = edge.target
-            if source in node_map and target in node_map:
-                scene.add_edge(node_map[source], node_map[target])
+            if 0 <= source < graph.vcount() and 0 <= target < graph.vcount():
+                edges.append((source, target))
             else:
                 raise ValueError(f"Edge references invalid vertices: {source} -> {target}")
 
+        scene.bulk_load(node_positions, edges)
         return True
 
     @staticmethod
@@ -252,7 +260,7 @@ class GraphImporter:
         if 'pyvis' not in AVAILABLE_LIBRARIES:
             raise ImportError("pyvis is not installed. Please install it with 'pip install pyvis'")
 
-        from pyvis.network import Network
+        Network = load_library('pyvis').Network
 
         globals_dict = {
             "Network": Network,
@@ -290,21 +298,18 @@ class GraphImporter:
 
             node_positions[node_id] = QPointF(float(x), float(y))
 
-        node_map = {}
-        for node in net.nodes:
-            node_id = str(node["id"])
-            pos = node_positions[node_id]
-            scene_node = scene.add_node(pos)
-            node_map[node_id] = scene_node
+        node_map = {node_id: i for i, node_id in enumerate(node_positions)}
 
+        edges = []
         for edge in net.edges:
             source = str(edge["from"])
             target = str(edge["to"])
             if source in node_map and target in node_map:
-                scene.add_edge(node_map[source], node_map[target])
+                edges.append((node_map[source], node_map[target]))
             else:
                 raise ValueError(f"Edge references invalid vertices: {source} -> {target}")
 
+        scene.bulk_load(list(node_positions.values()), edges)
         return True
 
 
@@ -314,11 +319,12 @@ class GraphImporter:
         if 'pygraphviz' not in AVAILABLE_LIBRARIES:
             raise ImportError("PyGraphviz is not installed")
             
-        G = AVAILABLE_LIBRARIES['pygraphviz'].AGraph(strict=False, directed=False)
+        pgv = load_library('pygraphviz')
+        G = pgv.AGraph(strict=False, directed=False)
         
         globals_dict = {
-            "pgv": AVAILABLE_LIBRARIES['pygraphviz'],
-            "pygraphviz": AVAILABLE_LIBRARIES['pygraphviz'],
+            "pgv": pgv,
+            "pygraphviz": pgv,
             "G": G
         }
         locals_dict = {}
@@ -331,6 +337,7 @@ class GraphImporter:
         G = locals_dict.get("G", G)
         
         node_map = {}
+        positions = []
         for node in G.nodes():
             try:
                 pos_str = G.get_node(node).attr.get('pos', '')
@@ -340,18 +347,20 @@ class GraphImporter:
                 else:
                     scene_pos = QPointF(0, 0)
                 
-                scene_node = scene.add_node(scene_pos)
-                node_map[node] = scene_node
+                node_map[node] = len(positions)
+                positions.append(scene_pos)
             except Exception as e:
                 raise ValueError(f"Error adding node '{node}': {str(e)}")
         
+        edges = []
         for edge in G.edges():
             try:
                 source, target = edge
                 if source in node_map and target in node_map:
-                    scene.add_edge(node_map[source], node_map[target])
+                    edges.append((node_map[source], node_map[target]))
             except Exception as e:
                 raise ValueError(f"Error adding edge {edge}: {str(e)}")
-                    
+
+        scene.bulk_load(positions, edges)
         return True
 
@@ -0,0 +1,110 @@
+from concurrent.futures import wait, FIRST_COMPLETED
+from models.graph import GraphSnapshot
+from utils.distance_metrics import extrema_from_eccentricities
+from utils.metrics_backends import select_backend
+from utils.worker_pool import WORKERS_AVAILABLE, get_pool
+
+# Components smaller than this are grouped into tasks of about this many nodes
+BATCH_NODES = 5000
+# Below this many nodes in total, starting worker processes costs more than it saves
+PARALLEL_MIN_NODES = 5000
+
+
+def component_snapshots(snapshot):
+    """Split a GraphSnapshot into one snapshot per connected component, largest first."""
+    if len(snapshot.components) <= 1:
+        return [snapshot]
+    component_index = {}
+    for i, members in enumerate(snapshot.components):
+        for node_id in members:
+            component_index[node_id] = i
+    edges = [[] for _ in snapshot.components]
+    for edge in snapshot.edges:
+        edges[component_index[edge[0]]].append(edge)
+    degrees = dict(zip(snapshot.nodes, snapshot.degrees))
+    return [
+        GraphSnapshot(snapshot.version, None, members, tuple(component_edges),
+                      tuple(degrees[node_id] for node_id in members), (members,))
+        for members, component_edges in zip(snapshot.components, edges)
+    ]
+
+
+def _component_extrema(snapshot, backend, is_cancelled=lambda: False):
+    if snapshot.num_nodes <= 2:
+        eccentricity = dict.fromkeys(snapshot.nodes, snapshot.num_nodes - 1)
+    else:
+        cls = select_backend("eccentricities", snapshot.num_nodes, backend)
+        eccentricity = cls(snapshot).eccentricities(False, is_cancelled)
+        if eccentricity is None:
+            return None
+    return dict(size=snapshot.num_nodes, **extrema_from_eccentricities(snapshot.nodes, eccentricity))
+
+
+def _batch_extrema(snapshots, backend):
+    return [_component_extrema(component, backend) for component in snapshots]
+
+
+def _batches(snapshots):
+    # Large components get a task each; small ones share tasks so that
+    # thousands of tiny components do not turn into thousands of tasks
+    batches = []
+    current = []
+    current_nodes = 0
+    for component in snapshots:
+        if component.num_nodes >= BATCH_NODES:
+            batches.append([component])
+            continue
+        current.append(component)
+        current_nodes += component.num_nodes
+        if current_nodes >= BATCH_NODES:
+            batches.append(current)
+            current = []
+            current_nodes = 0
+    if current:
+        batches.append(current)
+    return batches
+
+
+def component_distances(snapshot, backend="auto", eccentricity=None, is_cancelled=lambda: False):
+    """Diameter, radius, center and periphery of every connected component, largest first.
+
+    Each entry holds the component ``size`` and the keys returned by
+    extrema_from_eccentricities(). Eccentricities from a full sweep, which
+    already measures every node within its own component, can be passed in
+    and are simply grouped. Otherwise each component's are bounded
+    separately by the preferred backend, in worker processes when the graph
+    is large enough. Returns None if cancelled.
+    """
+    if eccentricity is not None:
+        return [
+            dict(size=len(members), **extrema_from_eccentricities(members, eccentricity))
+            for members in snapshot.components
+        ]
+
+    batches = _batches(component_snapshots(snapshot))
+    if not WORKERS_AVAILABLE or len(batches) < 2 or snapshot.num_nodes < PARALLEL_MIN_NODES:
+        results = []
+        for batch in batches:
+            for component in batch:
+                extrema = _component_extrema(component, backend, is_cancelled)
+                if extrema is None or is_cancelled():
+                    return None
+                results.append(extrema)
+        return results
+
+    futures = [get_pool().submit(_batch_extrema, batch, backend) for batch in batches]
+    pending = set(futures)
+    while pending:
+        _, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+        if is_cancelled():
+            for future in pending:
+                future.cancel()
+            return None
+    return [extrema for future in futures for extrema in future.result()]
+
+
+def component_summary(extrema):
+    """One-line description of a component_distances() entry."""
+    return (f"{extrema['size']} nodes: diameter {extrema['diameter']}, radius {extrema['radius']}, "
+            f"center {', '.join(map(str, extrema['center']))}; "
+            f"periphery {', '.join(map(str, extrema['periphery']))}")
@@ -1,162 +1,308 @@
-def export_networkx(scene):
-    code = "import networkx as nx\n\n"
-    code += "G = nx.Graph()\n\n"
-    
-    for node in scene.nodes.values():
-        code += f"G.add_node('{node.id}')\n"
-    
-    added_edges = set()
-    for node in scene.nodes.values():
-        for edge in node.edges:
-            edge_tuple = tuple(sorted([edge.source.id, edge.target.id]))
-            if edge_tuple not in added_edges:
-                code += f"G.add_edge('{edge.source.id}', '{edge.target.id}')\n"
-                added_edges.add(edge_tuple)
-    
-    code += "\n# Optional: If you want to preserve the layout\n"
-    code += "pos = {\n"
-    for node in scene.nodes.values():
-        code += f"    '{node.id}': ({node.pos.x()}, {node.pos.y()}),\n"
-    code += "}\n"
-    code += "nx.draw(G, pos=pos, with_labels=True)\n"
-    
-    return code
-
-def export_igraph(scene):
-    code = "import igraph as ig\n\n"
-    code += "g = ig.Graph()\n\n"
-    
-    code += f"g.add_vertices({len(scene.nodes)})\n"
-    code += "g.vs['name'] = " + str([node.id for node in scene.nodes.values()]) + "\n"
-    
-    edges = []
-    added_edges = set()
+import gzip
+import io
+import os
+
+# Bytes buffered before each write to disk when saving an export
+WRITE_BUFFER = 1 << 20
+# Chunks written between two progress reports
+PROGRESS_INTERVAL = 10_000
+# Elements per line of the list literals written in compact mode
+LITERAL_ITEMS_PER_LINE = 16
+
+
+def _literal(items):
+    """Yield a list literal one element at a time, wrapping long lists over several lines."""
+    yield "["
+    for i, item in enumerate(items):
+        if i % LITERAL_ITEMS_PER_LINE == 0:
+            yield f"\n    {item!r},"
+        else:
+            yield f" {item!r},"
+    yield "\n]"
+
+def _positions(scene):
+    return ((node.pos.x(), node.pos.y()) for node in scene.nodes.values())
+
+def _index_pairs(scene):
+    index = {node_id: i for i, node_id in enumerate(scene.nodes)}
+    return ((index[source_id], index[target_id]) for source_id, target_id in scene.graph.snapshot().edges)
+
+def iter_networkx(scene, compact=False):
+    yield "import networkx as nx\n\n"
+    yield "G = nx.Graph()\n\n"
+
+    if compact:
+        yield "nodes = "
+        yield from _literal(scene.nodes)
+        yield "\nG.add_nodes_from(nodes)\n"
+        yield "G.add_edges_from("
+        yield from _literal(scene.graph.snapshot().edges)
+        yield ")\n"
+        yield "\n# Optional: If you want to preserve the layout\n"
+        yield "pos = dict(zip(nodes, "
+        yield from _literal(_positions(scene))
+        yield "))\n"
+        yield "nx.draw(G, pos=pos, with_labels=True)\n"
+        return
+
     for node in scene.nodes.values():
-        for edge in node.edges:
-            edge_tuple = tuple(sorted([edge.source.id, edge.target.id]))
-            if edge_tuple not in added_edges:
-                edges.append((edge.source.id, edge.target.id))
-                added_edges.add(edge_tuple)
-    
-    code += "edges = " + str(edges) + "\n"
-    code += "g.add_edges(edges)\n\n"
-
-    code += "# Store node positions as a layout\n"
-    code += "layout = [\n"
+        yield f"G.add_node('{node.id}')\n"
+
+    for source_id, target_id in scene.graph.snapshot().edges:
+        yield f"G.add_edge('{source_id}', '{target_id}')\n"
+
+    yield "\n# Optional: If you want to preserve the layout\n"
+    yield "pos = {\n"
     for node in scene.nodes.values():
-        code += f"    ({node.pos.x()}, {node.pos.y()}),\n"
-    code += "]\n"
-    
-    return code
-
-def export_pyvis(scene):
-    code = "from pyvis.network import Network\n\n"
-    code += "net = Network()\n\n"
-    
+        yield f"    '{node.id}': ({node.pos.x()}, {node.pos.y()}),\n"
+    yield "}\n"
+    yield "nx.draw(G, pos=pos, with_labels=True)\n"
+
+def iter_igraph(scene, compact=False):
+    yield "import igraph as ig\n\n"
+
+    if compact:
+        yield "g = ig.Graph(n=%d, edges=" % len(scene.nodes)
+        yield from _literal(_index_pairs(scene))
+        yield ")\n"
+        yield "g.vs['name'] = "
+        yield from _literal(scene.nodes)
+        yield "\n\n# Store node positions as a layout\n"
+        yield "layout = "
+        yield from _literal(_positions(scene))
+        yield "\n"
+        return
+
+    yield "g = ig.Graph()\n\n"
+
+    yield f"g.add_vertices({len(scene.nodes)})\n"
+    yield "g.vs['name'] = [\n"
     for node in scene.nodes.values():
-        code += f"net.add_node('{node.id}', x={node.pos.x()}, y={node.pos.y()})\n"
-    
-    added_edges = set()
+        yield f"    '{node.id}',\n"
+    yield "]\n"
+
+    yield "edges = [\n"
+    for edge in scene.graph.snapshot().edges:
+        yield f"    {edge},\n"
+    yield "]\n"
+    yield "g.add_edges(edges)\n\n"
+
+    yield "# Store node positions as a layout\n"
+    yield "layout = [\n"
     for node in scene.nodes.values():
-        for edge in node.edges:
-            edge_tuple = tuple(sorted([edge.source.id, edge.target.id]))
-            if edge_tuple not in added_edges:
-                code += f"net.add_edge('{edge.source.id}', '{edge.target.id}')\n"
-                added_edges.add(edge_tuple)
-    
-    code += "\nnet.show('graph.html')\n"
-    return code
-
-def export_graphtool(scene):
-    code = "from graph_tool.all import *\n\n"
-    code += "g = Graph()\n"
-    code += "name = g.new_vertex_property('string')\n"
-    code += "pos = g.new_vertex_property('vector<double>')\n\n"
-    
-    code += "vertices = {}\n"
+        yield f"    ({node.pos.x()}, {node.pos.y()}),\n"
+    yield "]\n"
+
+def iter_pyvis(scene, compact=False):
+    yield "from pyvis.network import Network\n\n"
+    yield "net = Network()\n\n"
+
+    if compact:
+        yield "net.add_nodes(\n"
+        yield "    "
+        yield from _literal(scene.nodes)
+        yield ",\n    x="
+        yield from _literal(node.pos.x() for node in scene.nodes.values())
+        yield ",\n    y="
+        yield from _literal(node.pos.y() for node in scene.nodes.values())
+        yield ",\n)\n"
+        yield "net.add_edges("
+        yield from _literal(scene.graph.snapshot().edges)
+        yield ")\n"
+        yield "\nnet.show('graph.html')\n"
+        return
+
     for node in scene.nodes.values():
-        code += f"v = g.add_vertex()\n"
-        code += f"name[v] = '{node.id}'\n"
-        code += f"pos[v] = [{node.pos.x()}, {node.pos.y()}]\n"
-        code += f"vertices['{node.id}'] = v\n"
-    
-    added_edges = set()
+        yield f"net.add_node('{node.id}', x={node.pos.x()}, y={node.pos.y()})\n"
+
+    for source_id, target_id in scene.graph.snapshot().edges:
+        yield f"net.add_edge('{source_id}', '{target_id}')\n"
+
+    yield "\nnet.show('graph.html')\n"
+
+def iter_graphtool(scene, compact=False):
+    yield "from graph_tool.all import *\n\n"
+    yield "g = Graph()\n"
+
+    if compact:
+        yield f"g.add_vertex({len(scene.nodes)})\n"
+        yield "name = g.new_vertex_property('string', vals="
+        yield from _literal(scene.nodes)
+        yield ")\n"
+        yield "pos = g.new_vertex_property('vector<double>', vals="
+        yield from _literal(_positions(scene))
+        yield ")\n"
+        yield "g.add_edge_list("
+        yield from _literal(_index_pairs(scene))
+        yield ")\n"
+        return
+
+    yield "name = g.new_vertex_property('string')\n"
+    yield "pos = g.new_vertex_property('vector<double>')\n\n"
+
+    yield "vertices = {}\n"
     for node in scene.nodes.values():
-        for edge in node.edges:
-            edge_tuple = tuple(sorted([edge.source.id, edge.target.id]))
-            if edge_tuple not in added_edges:
-                code += f"g.add_edge(vertices['{edge.source.id}'], vertices['{edge.target.id}'])\n"
-                added_edges.add(edge_tuple)
-    
-    return code
-
-def export_dgl(scene):
-    code = "import dgl\n"
-    code += "import torch\n\n"
-    
-    code += "# Create node ID mappings\n"
-    code += "node_mapping = {\n"
+        yield (
+            f"v = g.add_vertex()\n"
+            f"name[v] = '{node.id}'\n"
+            f"pos[v] = [{node.pos.x()}, {node.pos.y()}]\n"
+            f"vertices['{node.id}'] = v\n"
+        )
+
+    for source_id, target_id in scene.graph.snapshot().edges:
+        yield f"g.add_edge(vertices['{source_id}'], vertices['{target_id}'])\n"
+
+def iter_dgl(scene, compact=False):
+    yield "import dgl\n"
+    yield "import torch\n\n"
+
+    if compact:
+        yield "# Node ids, in the order of the DGL node indices\n"
+        yield "node_ids = "
+        yield from _literal(scene.nodes)
+        yield "\n\n# Create edge lists\n"
+        yield "src_nodes, dst_nodes = torch.tensor("
+        yield from _literal(_index_pairs(scene))
+        yield ", dtype=torch.int64).reshape(-1, 2).T\n\n"
+        yield "# Create DGL graph\n"
+        yield f"g = dgl.graph((src_nodes, dst_nodes), num_nodes={len(scene.nodes)})\n"
+        return
+
+    yield "# Create node ID mappings\n"
+    yield "node_mapping = {\n"
     for i, node in enumerate(scene.nodes.values()):
-        code += f"    '{node.id}': {i},\n"
-    code += "}\n\n"
-    
-    src_nodes = []
-    dst_nodes = []
-    added_edges = set()
-    for node in scene.nodes.values():
-        for edge in node.edges:
-            edge_tuple = tuple(sorted([edge.source.id, edge.target.id]))
-            if edge_tuple not in added_edges:
-                src_nodes.append(f"node_mapping['{edge.source.id}']")
-                dst_nodes.append(f"node_mapping['{edge.target.id}']")
-                added_edges.add(edge_tuple)
-    
-    code += "# Create edge lists\n"
-    code += f"src_nodes = torch.tensor([{', '.join(src_nodes)}])\n"
-    code += f"dst_nodes = torch.tensor([{', '.join(dst_nodes)}])\n\n"
-    
-    code += "# Create DGL graph\n"
-    code += "g = dgl.graph((src_nodes, dst_nodes))\n"
-    
-    return code
-
-def export_snap(scene):
-    code = "import snap\n\n"
-    code += "# Create an undirected graph\n"
-    code += "G = snap.TNGraph.New()\n\n"
-    
-    code += "# Add nodes\n"
-    for node in scene.nodes.values():
-        code += f"G.AddNode(int('{node.id}'[1:]))\n"
-    
-    code += "\n# Add edges\n"
-    added_edges = set()
+        yield f"    '{node.id}': {i},\n"
+    yield "}\n\n"
+
+    edges = scene.graph.snapshot().edges
+    yield "# Create edge lists\n"
+    yield "src_nodes = torch.tensor([\n"
+    for source_id, _ in edges:
+        yield f"    node_mapping['{source_id}'],\n"
+    yield "])\n"
+    yield "dst_nodes = torch.tensor([\n"
+    for _, target_id in edges:
+        yield f"    node_mapping['{target_id}'],\n"
+    yield "])\n\n"
+
+    yield "# Create DGL graph\n"
+    yield "g = dgl.graph((src_nodes, dst_nodes))\n"
+
+def iter_snap(scene, compact=False):
+    yield "import snap\n\n"
+    yield "# Create an undirected graph\n"
+    yield "G = snap.TNGraph.New()\n\n"
+
+    if compact:
+        # SNAP has no bulk insertion, so loop over literal id lists instead
+        yield "# Add nodes\n"
+        yield "for node in "
+        yield from _literal(int(node_id[1:]) for node_id in scene.nodes)
+        yield ":\n    G.AddNode(node)\n"
+        yield "\n# Add edges\n"
+        yield "for source, target in "
+        yield from _literal(
+            (int(source_id[1:]), int(target_id[1:])) for source_id, target_id in scene.graph.snapshot().edges)
+        yield ":\n    G.AddEdge(source, target)\n"
+        return
+
+    yield "# Add nodes\n"
     for node in scene.nodes.values():
-        for edge in node.edges:
-            edge_tuple = tuple(sorted([edge.source.id, edge.target.id]))
-            if edge_tuple not in added_edges:
-                code += f"G.AddEdge(int('{edge.source.id}'[1:]), int('{edge.target.id}'[1:]))\n"
-                added_edges.add(edge_tuple)
-    
-    return code
-
-def export_pygraphviz(scene):
-    code = "import pygraphviz as pgv\n\n"
-    code += "# Create a new undirected graph\n"
-    code += "G = pgv.AGraph(strict=False, directed=False)\n\n"
-    
-    code += "# Add nodes with their positions\n"
+        yield f"G.AddNode(int('{node.id}'[1:]))\n"
+
+    yield "\n# Add edges\n"
+    for source_id, target_id in scene.graph.snapshot().edges:
+        yield f"G.AddEdge(int('{source_id}'[1:]), int('{target_id}'[1:]))\n"
+
+def iter_pygraphviz(scene, compact=False):
+    yield "import pygraphviz as pgv\n\n"
+    yield "# Create a new undirected graph\n"
+    yield "G = pgv.AGraph(strict=False, directed=False)\n\n"
+
+    if compact:
+        yield "# Add nodes with their positions\n"
+        yield "nodes = "
+        yield from _literal(scene.nodes)
+        yield "\nG.add_nodes_from(nodes)\n"
+        yield "for node, pos in zip(nodes, "
+        yield from _literal(f"{x},{y}!" for x, y in _positions(scene))
+        yield "):\n    G.get_node(node).attr['pos'] = pos\n"
+        yield "\n# Add edges\n"
+        yield "G.add_edges_from("
+        yield from _literal(scene.graph.snapshot().edges)
+        yield ")\n"
+        return
+
+    yield "# Add nodes with their positions\n"
     for node in scene.nodes.values():
         pos = f"{node.pos.x()},{node.pos.y()}!"
-        code += f"G.add_node('{node.id}', pos='{pos}')\n"
-    
-    code += "\n# Add edges\n"
-    added_edges = set()
-    for node in scene.nodes.values():
-        for edge in node.edges:
-            edge_tuple = tuple(sorted([edge.source.id, edge.target.id]))
-            if edge_tuple not in added_edges:
-                code += f"G.add_edge('{edge.source.id}', '{edge.target.id}')\n"
-                added_edges.add(edge_tuple)
-    
-    return code 
\ No newline at end of file
+        yield f"G.add_node('{node.id}', pos='{pos}')\n"
+
+    yield "\n# Add edges\n"
+    for source_id, target_id in scene.graph.snapshot().edges:
+        yield f"G.add_edge('{source_id}', '{target_id}')\n"
+
+# Library name -> (chunk generator, (chunks per node, chunks per edge) in
+# statement mode, the same in compact mode); the per-element counts size
+# the progress bar of long exports
+EXPORTERS = {
+    "NetworkX": (iter_networkx, (2, 1), (2, 1)),
+    "igraph": (iter_igraph, (2, 1), (2, 1)),
+    "PyVis": (iter_pyvis, (1, 1), (3, 1)),
+    "Graph-tool": (iter_graphtool, (1, 1), (2, 1)),
+    "PyGraphviz": (iter_pygraphviz, (1, 1), (2, 1)),
+    "DGL": (iter_dgl, (1, 2), (1, 1)),
+    "SNAP": (iter_snap, (1, 1), (1, 1)),
+}
+
+def export_code(library, scene, compact=False):
+    """Return the whole export for ``library`` as one string."""
+    return "".join(EXPORTERS[library][0](scene, compact))
+
+def export_chunk_count(library, scene, compact=False):
+    """Approximate number of chunks the exporter for ``library`` yields."""
+    per_node, per_edge = EXPORTERS[library][2 if compact else 1]
+    return per_node * scene.graph.number_of_nodes() + per_edge * len(scene.graph.snapshot().edges)
+
+def write_export(chunks, file_name, progress=None):
+    """Stream ``chunks`` to ``file_name``, gzip-compressed if it ends in ``.gz``.
+
+    ``progress`` is called with the number of chunks written so far every
+    PROGRESS_INTERVAL chunks; returning False cancels the export and removes
+    the partial file. Returns True if the export completed.
+    """
+    if file_name.endswith(".gz"):
+        # Compress large blocks rather than every small chunk
+        f = io.TextIOWrapper(io.BufferedWriter(gzip.open(file_name, "wb"), WRITE_BUFFER), encoding="utf-8")
+    else:
+        f = open(file_name, "w", encoding="utf-8", buffering=WRITE_BUFFER)
+    with f:
+        for count, chunk in enumerate(chunks, start=1):
+            f.write(chunk)
+            if progress is not None and count % PROGRESS_INTERVAL == 0 and progress(count) is False:
+                break
+        else:
+            return True
+    os.remove(file_name)
+    return False
+
+def export_networkx(scene, compact=False):
+    return export_code("NetworkX", scene, compact)
+
+def export_igraph(scene, compact=False):
+    return export_code("igraph", scene, compact)
+
+def export_pyvis(scene, compact=False):
+    return export_code("PyVis", scene, compact)
+
+def export_graphtool(scene, compact=False):
+    return export_code("Graph-tool", scene, compact)
+
+def export_dgl(scene, compact=False):
+    return export_code("DGL", scene, compact)
+
+def export_snap(scene, compact=False):
+    return export_code("SNAP", scene, compact)
+
+def export_pygraphviz(scene, compact=False):
+    return export_code("PyGraphviz", scene, compact)
@@ -0,0 +1,240 @@
+import gzip
+import importlib.util
+import math
+import struct
+import zipfile
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QColor
+
+# NumPy and the XML modules are imported by the readers and writers that use
+# them, since this module is loaded at startup
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# File dialog filters; the extension of the chosen file selects the format
+FILE_FILTERS = {
+    "npz": "NumPy graph (*.npz)",
+    "edgelist": "Edge list (*.edgelist *.edges *.edgelist.gz *.edges.gz)",
+    "graphml": "GraphML (*.graphml *.graphml.gz)",
+}
+# Spacing between nodes placed on a grid when the file has no positions
+GRID_SPACING = 60
+GRAPHML_NS = "{http://graphml.graphdrawing.org/xmlns}"
+
+
+def format_of(file_name):
+    """Name of the format a file name selects, or None if it is not a graph file."""
+    name = file_name.lower()
+    # np.savez() always appends .npz, so only the text formats may be gzipped
+    if name.endswith(".npz"):
+        return "npz"
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith((".edgelist", ".edges")):
+        return "edgelist"
+    if name.endswith(".graphml"):
+        return "graphml"
+    return None
+
+
+def save_graph(scene, file_name):
+    {"npz": save_npz, "edgelist": save_edgelist, "graphml": save_graphml}[format_of(file_name)](scene, file_name)
+
+
+def load_graph(scene, file_name):
+    """Replace the scene contents with the graph stored in ``file_name``."""
+    {"npz": load_npz, "edgelist": load_edgelist, "graphml": load_graphml}[format_of(file_name)](scene, file_name)
+
+
+def _open_text(file_name, mode):
+    if file_name.endswith(".gz"):
+        return gzip.open(file_name, mode + "t", encoding="utf-8")
+    return open(file_name, mode, encoding="utf-8")
+
+
+def _scene_edges(scene):
+    # Every edge is listed by both endpoints; keep it once, parallel edges included
+    for node in scene.nodes.values():
+        for edge in node.edges:
+            if edge.source is node:
+                yield edge.source.id, edge.target.id
+
+
+def _grid_positions(count):
+    columns = max(1, math.ceil(math.sqrt(count)))
+    return [QPointF((i % columns) * GRID_SPACING, (i // columns) * GRID_SPACING) for i in range(count)]
+
+
+def _populate(scene, node_ids, edges, positions=None, radii=None, colors=None):
+    """Replace the scene contents with node ids and (source id, target id) pairs."""
+    if positions is None:
+        positions = _grid_positions(len(node_ids))
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    scene.bulk_load(positions, [(index[source_id], index[target_id]) for source_id, target_id in edges],
+                    radii, colors)
+
+
+def save_npz(scene, file_name):
+    """Store the graph as a symmetric CSR adjacency plus per-node arrays.
+
+    Members are written uncompressed so that load_npz() can memory-map them.
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy is required for the .npz format. Please install it with 'pip install numpy'")
+    import numpy as np
+    nodes = list(scene.nodes.values())
+    index = {node.id: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[source_id], index[target_id]) for source_id, target_id in _scene_edges(scene)],
+                     dtype=np.int64).reshape(-1, 2)
+    rows = np.concatenate([edges[:, 0], edges[:, 1]])
+    cols = np.concatenate([edges[:, 1], edges[:, 0]])
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(nodes)), out=indptr[1:])
+    np.savez(
+        file_name,
+        node_ids=np.array([node.id for node in nodes], dtype=str),
+        indptr=indptr,
+        indices=cols[order],
+        pos=np.array([(node.pos.x(), node.pos.y()) for node in nodes], dtype=np.float64).reshape(-1, 2),
+        radius=np.array([node.radius for node in nodes], dtype=np.float64),
+        color=np.array([node.color.rgba() for node in nodes], dtype=np.uint32),
+    )
+
+
+def _memmap_member(file_name, archive, name):
+    # np.load() ignores mmap_mode for .npz archives, but members stored
+    # without compression are plain .npy files at a known offset
+    import numpy as np
+
+    info = archive.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(file_name, "rb") as f:
+        f.seek(info.header_offset)
+        name_length, extra_length = struct.unpack("<HH", f.read(30)[26:30])
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if dtype.hasobject:
+        return None
+    if not math.prod(shape):
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(file_name, dtype=dtype, mode="r", shape=shape, offset=offset,
+                     order="F" if fortran_order else "C")
+
+
+def load_npz(scene, file_name):
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy is required for the .npz format. Please install it with 'pip install numpy'")
+    import numpy as np
+    arrays = {}
+    with zipfile.ZipFile(file_name) as archive, np.load(file_name) as stored:
+        for name in stored.files:
+            array = _memmap_member(file_name, archive, name + ".npy")
+            arrays[name] = stored[name] if array is None else array
+
+    # The arrays are handed to bulk_load() as they are, indexed by node
+    # position, so the mapped members are never copied into Python lists
+    indptr = arrays["indptr"]
+    indices = arrays["indices"]
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    # Each undirected edge is stored in both directions
+    upper = rows < indices
+    if "pos" in arrays:
+        pos = arrays["pos"]
+        positions = [QPointF(x, y) for x, y in zip(pos[:, 0], pos[:, 1])]
+    else:
+        positions = _grid_positions(len(indptr) - 1)
+    colors = [QColor.fromRgba(int(value)) for value in arrays["color"]] if "color" in arrays else None
+    scene.bulk_load(positions, zip(rows[upper], indices[upper]), arrays.get("radius"), colors)
+
+
+def save_edgelist(scene, file_name):
+    """Write every node id on a line of its own, in scene order, then one "source target" line per edge.
+
+    Listing the nodes first keeps their order, and so their ids, when the
+    file is loaded back.
+    """
+    with _open_text(file_name, "w") as f:
+        f.write("# Graph Editor edge list: node ids, then source target\n")
+        for node in scene.nodes.values():
+            f.write(f"{node.id}\n")
+        for source_id, target_id in _scene_edges(scene):
+            f.write(f"{source_id} {target_id}\n")
+
+
+def load_edgelist(scene, file_name):
+    node_ids = {}  # Insertion-ordered set of node ids
+    edges = []
+    with _open_text(file_name, "r") as f:
+        for line in f:
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            for node_id in fields[:2]:
+                node_ids.setdefault(node_id)
+            if len(fields) >= 2:
+                edges.append((fields[0], fields[1]))
+    _populate(scene, list(node_ids), edges)
+
+
+def save_graphml(scene, file_name):
+    from xml.sax.saxutils import quoteattr
+
+    with _open_text(file_name, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        f.write('  <key id="x" for="node" attr.name="x" attr.type="double"/>\n')
+        f.write('  <key id="y" for="node" attr.name="y" attr.type="double"/>\n')
+        f.write('  <key id="radius" for="node" attr.name="radius" attr.type="double"/>\n')
+        f.write('  <key id="color" for="node" attr.name="color" attr.type="string"/>\n')
+        f.write('  <graph edgedefault="undirected">\n')
+        for node in scene.nodes.values():
+            f.write(
+                f'    <node id={quoteattr(str(node.id))}>'
+                f'<data key="x">{node.pos.x()}</data><data key="y">{node.pos.y()}</data>'
+                f'<data key="radius">{node.radius}</data>'
+                f'<data key="color">{node.color.name(QColor.NameFormat.HexArgb)}</data></node>\n'
+            )
+        for source_id, target_id in _scene_edges(scene):
+            f.write(f'    <edge source={quoteattr(str(source_id))} target={quoteattr(str(target_id))}/>\n')
+        f.write('  </graph>\n')
+        f.write('</graphml>\n')
+
+
+def load_graphml(scene, file_name):
+    """Read nodes and edges with iterparse, releasing each element once handled."""
+    from xml.etree.ElementTree import iterparse
+
+    keys = {}  # key id -> attribute name
+    node_ids = []
+    attributes = []
+    edges = []
+    with _open_text(file_name, "r") as f:
+        for _, element in iterparse(f, events=("end",)):
+            tag = element.tag.replace(GRAPHML_NS, "")
+            if tag == "key":
+                keys[element.get("id")] = element.get("attr.name", element.get("id"))
+            elif tag == "node":
+                node_ids.append(element.get("id"))
+                attributes.append({
+                    keys.get(data.get("key"), data.get("key")): data.text
+                    for data in element.iter(GRAPHML_NS + "data")
+                })
+                element.clear()
+            elif tag == "edge":
+                edges.append((element.get("source"), element.get("target")))
+                element.clear()
+
+    positions = radii = colors = None
+    if node_ids and all("x" in values and "y" in values for values in attributes):
+        positions = [QPointF(float(values["x"]), float(values["y"])) for values in attributes]
+    if node_ids and all("radius" in values for values in attributes):
+        radii = [float(values["radius"]) for values in attributes]
+    if node_ids and all("color" in values for values in attributes):
+        colors = [QColor(values["color"]) for values in attributes]
+    _populate(scene, node_ids, edges, positions, radii, colors)
@@ -0,0 +1,62 @@
+import heapq
+import math
+
+DEFAULT_TOP_K = 10
+DEFAULT_BINS = 10
+# Width of the longest bar in text histograms
+HISTOGRAM_WIDTH = 30
+
+
+def top_k(nodes, values, k=DEFAULT_TOP_K):
+    """The ``k`` nodes with the largest values, as (node id, value) pairs.
+
+    ``values`` is a sequence aligned with ``nodes``; NaN values are skipped.
+    heapq keeps only k candidates while scanning, so this costs O(n log k)
+    instead of a full sort.
+    """
+    best = heapq.nlargest(k, (i for i in range(len(values)) if not math.isnan(values[i])),
+                          key=values.__getitem__)
+    return [(nodes[i], values[i]) for i in best]
+
+
+def histogram(values, bins=DEFAULT_BINS, discrete=False):
+    """Counts of ``values`` in equal-width bins between their minimum and maximum.
+
+    Returns (bin edges, counts) with ``len(edges) == len(counts) + 1``, using
+    one pass to find the range and one to count. With ``discrete`` set, the
+    values are integers and every bin spans a whole number of them. NaN
+    values are left out of the counts.
+    """
+    values = [value for value in values if not math.isnan(value)]
+    if not values:
+        return [], []
+    low = min(values)
+    high = max(values)
+    if discrete:
+        width = max(1, math.ceil((high - low + 1) / bins))
+        bins = math.ceil((high - low + 1) / width)
+    elif low == high:
+        return [low, high], [len(values)]
+    else:
+        width = (high - low) / bins
+    counts = [0] * bins
+    for value in values:
+        # The maximum belongs to the last bin rather than one past it
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    return [low + i * width for i in range(bins + 1)], counts
+
+
+def format_histogram(edges, counts, discrete=False):
+    """Text rendering of a histogram, one line per bin."""
+    peak = max(counts, default=0) or 1
+    lines = []
+    for i, count in enumerate(counts):
+        if not discrete:
+            label = f"[{edges[i]:.3f}, {edges[i + 1]:.3f}]"
+        elif edges[i + 1] - edges[i] == 1:
+            label = f"{edges[i]}"
+        else:
+            label = f"{edges[i]}\u2013{edges[i + 1] - 1}"
+        bar = "\u2588" * round(HISTOGRAM_WIDTH * count / peak)
+        lines.append(f"{label} {bar} {count}")
+    return lines
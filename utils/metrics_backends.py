@@ -0,0 +1,387 @@
+import functools
+import importlib
+import math
+import random
+from utils.distance_metrics import (distance_sweep, bounded_eccentricities,
+                                    closeness_from_sweep)
+from utils.sparse_metrics import SparseGraph, SPARSE_AVAILABLE
+from utils.parallel_betweenness import PARALLEL_AVAILABLE, csr_from_snapshot, parallel_betweenness
+
+# Capability names, one per metric implementation a backend may provide
+CAPABILITIES = (
+    "eccentricities",
+    "degree_centrality",
+    "betweenness_centrality",
+    "approximate_betweenness",
+    "closeness_centrality",
+    "approximate_closeness",
+    "eigenvector_centrality",
+)
+
+BACKENDS = {}  # name -> backend class, in registration order
+
+
+def register_backend(cls):
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def available_backends():
+    return [cls for cls in BACKENDS.values() if cls.available()]
+
+
+def select_backend(capability, num_nodes, preferred="auto"):
+    """Pick the backend class that should compute ``capability``.
+
+    A backend chosen by the user wins whenever it implements the metric;
+    otherwise the highest-priority available one is used, skipping backends
+    whose setup cost only pays off above ``auto_min_nodes``.
+    """
+    candidates = [cls for cls in available_backends() if capability in cls.capabilities]
+    for cls in candidates:
+        if cls.name == preferred:
+            return cls
+    eligible = [cls for cls in candidates if num_nodes >= cls.auto_min_nodes] or candidates
+    return max(eligible, key=lambda cls: cls.priority)
+
+
+def capability_table():
+    """Map each available backend label to the sorted metrics it implements."""
+    return {
+        cls.label: [capability for capability in CAPABILITIES if capability in cls.capabilities]
+        for cls in available_backends()
+    }
+
+
+class MetricsBackend:
+    """Base class of metric backends.
+
+    A backend is built once per GraphSnapshot. Per-node metrics are returned
+    as dicts keyed by node id, scalar metrics as plain floats, matching what
+    NetworkX returns, so results do not depend on the engine that made them.
+    """
+    name = None
+    label = None
+    priority = 0  # Higher is preferred when picking automatically
+    auto_min_nodes = 0
+    capabilities = frozenset()
+
+    @staticmethod
+    def available():
+        return True
+
+    def __init__(self, snapshot):
+        self.nodes = snapshot.nodes
+        self.n = len(snapshot.nodes)
+
+
+class _SweepBackend(MetricsBackend):
+    """Shared logic for backends whose exact distances come from a full BFS sweep.
+
+    The sweep gives eccentricities, distance sums and reach counts at once, so
+    exact closeness after eccentricities costs nothing extra. Subclasses
+    must override _distance_sweep(), _bounded_eccentricities() and
+    _approximate_closeness().
+    """
+    def __init__(self, snapshot):
+        super().__init__(snapshot)
+        self._sweep = None
+
+    def _distance_sweep(self, is_cancelled):
+        """(eccentricity, distance sums, reach counts) from a BFS per node, or None if cancelled."""
+        raise NotImplementedError
+
+    def _bounded_eccentricities(self, is_cancelled):
+        """Eccentricities by the bounding algorithm, or None if cancelled."""
+        raise NotImplementedError
+
+    def _approximate_closeness(self, pivots, seed):
+        """Closeness estimated from ``pivots`` sampled source nodes."""
+        raise NotImplementedError
+
+    def eccentricities(self, exhaustive, is_cancelled=lambda: False):
+        if not exhaustive:
+            return self._bounded_eccentricities(is_cancelled)
+        if self._sweep is None:
+            self._sweep = self._distance_sweep(is_cancelled)
+        return None if self._sweep is None else self._sweep[0]
+
+    def closeness_centrality(self, pivots=None, seed=0, is_cancelled=lambda: False):
+        if pivots is not None:
+            return self._approximate_closeness(pivots, seed)
+        if self._sweep is None:
+            self._sweep = self._distance_sweep(is_cancelled)
+            if self._sweep is None:
+                return None
+        return closeness_from_sweep(self.nodes, self._sweep[1], self._sweep[2])
+
+
+def _import_networkx():
+    # NetworkX is slow to import, so it is loaded with the first backend that needs it
+    import networkx
+    return networkx
+
+
+def approximate_closeness_centrality(G, pivots, seed=0):
+    """Estimate closeness centrality from BFS runs started at ``pivots`` random nodes.
+
+    The average distance of each node is estimated from its distances to the
+    pivots in its component; the result is scaled like NetworkX's
+    ``wf_improved`` closeness. Nodes whose component holds no pivot get exact values.
+    """
+    nx = _import_networkx()
+    n = len(G)
+    sampled = random.Random(seed).sample(list(G), pivots)
+    distance_sums = dict.fromkeys(G, 0)
+    pivot_counts = dict.fromkeys(G, 0)
+    component_sizes = {}
+
+    for pivot in sampled:
+        lengths = nx.single_source_shortest_path_length(G, pivot)
+        for node, distance in lengths.items():
+            distance_sums[node] += distance
+            pivot_counts[node] += 1
+            component_sizes[node] = len(lengths)
+
+    closeness = {}
+    sampled_set = set(sampled)
+    for node in G:
+        # A pivot does not count towards its own average
+        others = pivot_counts[node] - (node in sampled_set)
+        if others == 0:
+            # No other pivot in this component: measure the node directly
+            lengths = nx.single_source_shortest_path_length(G, node)
+            reachable = len(lengths)
+            total = sum(lengths.values())
+        else:
+            reachable = component_sizes[node]
+            total = distance_sums[node] * (reachable - 1) / others
+        closeness[node] = 0.0 if total == 0 else (reachable - 1) / total * (reachable - 1) / max(n - 1, 1)
+    return closeness
+
+
+@register_backend
+class NetworkXBackend(_SweepBackend):
+    name = "networkx"
+    label = "NetworkX"
+    priority = 0
+    capabilities = frozenset(CAPABILITIES)
+
+    def __init__(self, snapshot):
+        super().__init__(snapshot)
+        self.adjacency = snapshot.adjacency
+        self.nx = _import_networkx()
+        self.G = self.nx.Graph()
+        self.G.add_nodes_from(snapshot.nodes)
+        self.G.add_edges_from(snapshot.edges)
+
+    def degree_centrality(self):
+        return self.nx.degree_centrality(self.G)
+
+    def _distance_sweep(self, is_cancelled):
+        return distance_sweep(self.adjacency, self.nodes, is_cancelled)
+
+    def _bounded_eccentricities(self, is_cancelled):
+        return bounded_eccentricities(self.adjacency, self.nodes, is_cancelled)
+
+    def _approximate_closeness(self, pivots, seed):
+        return approximate_closeness_centrality(self.G, pivots, seed)
+
+    def betweenness_centrality(self, pivots=None, seed=0, is_cancelled=lambda: False):
+        if pivots is None:
+            return self.nx.betweenness_centrality(self.G)
+        return self.nx.betweenness_centrality(self.G, k=pivots, seed=seed)
+
+    def eigenvector_centrality(self):
+        return self.nx.eigenvector_centrality(self.G)
+
+
+@register_backend
+class ScipyBackend(_SweepBackend):
+    name = "scipy"
+    label = "NumPy/SciPy"
+    priority = 1
+    auto_min_nodes = 2000  # Building the CSR matrix only pays off on larger graphs
+    capabilities = frozenset({
+        "eccentricities",
+        "degree_centrality",
+        "closeness_centrality",
+        "approximate_closeness",
+        "eigenvector_centrality",
+    })
+
+    @staticmethod
+    def available():
+        return SPARSE_AVAILABLE
+
+    def __init__(self, snapshot):
+        super().__init__(snapshot)
+        self.graph = SparseGraph(snapshot)
+
+    def degree_centrality(self):
+        return self.graph.degree_centrality()
+
+    def _distance_sweep(self, is_cancelled):
+        return self.graph.distance_sweep(is_cancelled)
+
+    def _bounded_eccentricities(self, is_cancelled):
+        return self.graph.bounded_eccentricities(is_cancelled)
+
+    def _approximate_closeness(self, pivots, seed):
+        return self.graph.approximate_closeness_centrality(pivots, seed)
+
+    def eigenvector_centrality(self):
+        return self.graph.eigenvector_centrality()
+
+
+@register_backend
+class ParallelBackend(MetricsBackend):
+    name = "parallel"
+    label = "Parallel Brandes"
+    priority = 1
+    auto_min_nodes = 1000  # Below this, starting the worker processes costs more than it saves
+    capabilities = frozenset({"betweenness_centrality"})
+
+    @staticmethod
+    def available():
+        return PARALLEL_AVAILABLE
+
+    def __init__(self, snapshot):
+        super().__init__(snapshot)
+        self.indptr, self.indices = csr_from_snapshot(snapshot)
+
+    def betweenness_centrality(self, pivots=None, seed=0, is_cancelled=lambda: False):
+        values = parallel_betweenness(self.indptr, self.indices, is_cancelled)
+        return None if values is None else dict(zip(self.nodes, values.tolist()))
+
+
+@functools.cache
+def _importable(module):
+    """True if ``module`` imports cleanly.
+
+    Backends are only offered when their library actually loads, not merely
+    when it is installed; the import is tried once, on first use.
+    """
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        return False
+    return True
+
+
+def _import_igraph():
+    import igraph
+    return igraph
+
+
+@register_backend
+class IGraphBackend(MetricsBackend):
+    name = "igraph"
+    label = "igraph"
+    priority = 2
+    capabilities = frozenset({
+        "eccentricities",
+        "betweenness_centrality",
+        "closeness_centrality",
+        "eigenvector_centrality",
+    })
+
+    @staticmethod
+    def available():
+        return _importable("igraph")
+
+    def __init__(self, snapshot):
+        super().__init__(snapshot)
+        ig = _import_igraph()
+        index = {node_id: i for i, node_id in enumerate(self.nodes)}
+        self.g = ig.Graph(n=self.n, edges=[(index[source], index[target]) for source, target in snapshot.edges])
+        self._membership = None
+
+    def _component_sizes(self):
+        if self._membership is None:
+            self._membership = self.g.connected_components().membership
+        counts = {}
+        for label in self._membership:
+            counts[label] = counts.get(label, 0) + 1
+        return [counts[label] for label in self._membership]
+
+    def _as_dict(self, values):
+        return dict(zip(self.nodes, values))
+
+    def eccentricities(self, exhaustive, is_cancelled=lambda: False):
+        return self._as_dict([int(value) for value in self.g.eccentricity()])
+
+    def betweenness_centrality(self, pivots=None, seed=0, is_cancelled=lambda: False):
+        # igraph counts each pair once; NetworkX normalizes by (n-1)(n-2)/2 pairs
+        scale = 2 / ((self.n - 1) * (self.n - 2)) if self.n > 2 else 1
+        return self._as_dict([value * scale for value in self.g.betweenness(directed=False)])
+
+    def closeness_centrality(self, pivots=None, seed=0, is_cancelled=lambda: False):
+        # igraph normalizes within each component; rescale like NetworkX's wf_improved
+        sizes = self._component_sizes()
+        closeness = self.g.closeness(normalized=True)
+        return self._as_dict([
+            0.0 if math.isnan(value) or self.n <= 1 else value * (size - 1) / (self.n - 1)
+            for value, size in zip(closeness, sizes)
+        ])
+
+    def eigenvector_centrality(self):
+        values = self.g.eigenvector_centrality(scale=False)
+        norm = math.sqrt(sum(value * value for value in values)) or 1
+        return self._as_dict([value / norm for value in values])
+
+
+def _import_graph_tool():
+    import graph_tool.all as gt
+    return gt
+
+
+@register_backend
+class GraphToolBackend(MetricsBackend):
+    name = "graph-tool"
+    label = "graph-tool"
+    priority = 3
+    capabilities = frozenset({
+        "betweenness_centrality",
+        "closeness_centrality",
+        "eigenvector_centrality",
+    })
+
+    @staticmethod
+    def available():
+        return _importable("graph_tool.all")
+
+    def __init__(self, snapshot):
+        super().__init__(snapshot)
+        self.gt = _import_graph_tool()
+        index = {node_id: i for i, node_id in enumerate(self.nodes)}
+        self.g = self.gt.Graph(directed=False)
+        self.g.add_vertex(self.n)
+        self.g.add_edge_list([(index[source], index[target]) for source, target in snapshot.edges])
+
+    def _as_dict(self, vertex_property):
+        return dict(zip(self.nodes, (float(value) for value in vertex_property.a)))
+
+    def _component_sizes(self):
+        labels, counts = self.gt.label_components(self.g)
+        return [int(counts[label]) for label in labels.a]
+
+    def betweenness_centrality(self, pivots=None, seed=0, is_cancelled=lambda: False):
+        # Normalized by (n-1)(n-2)/2 for undirected graphs, like NetworkX
+        vertex_betweenness, _ = self.gt.betweenness(self.g)
+        return self._as_dict(vertex_betweenness)
+
+    def closeness_centrality(self, pivots=None, seed=0, is_cancelled=lambda: False):
+        # graph-tool normalizes within each component; rescale like NetworkX's wf_improved
+        closeness = self.gt.closeness(self.g).a
+        sizes = self._component_sizes()
+        return dict(zip(self.nodes, (
+            0.0 if math.isnan(value) or self.n <= 1 else float(value) * (size - 1) / (self.n - 1)
+            for value, size in zip(closeness, sizes)
+        )))
+
+    def eigenvector_centrality(self):
+        _, vector = self.gt.eigenvector(self.g)
+        values = [abs(float(value)) for value in vector.a]
+        norm = math.sqrt(sum(value * value for value in values)) or 1
+        return dict(zip(self.nodes, (value / norm for value in values)))
@@ -0,0 +1,260 @@
+import math
+from collections import OrderedDict
+from PyQt6 import sip
+from PyQt6.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+from utils.component_distances import component_distances
+from utils.metrics_backends import select_backend
+
+# Metrics computed in the background, in the order they are published
+METRIC_NAMES = (
+    "sampling",
+    "backends",
+    "distances",
+    "degree_centrality",
+    "betweenness_centrality",
+    "closeness_centrality",
+    "eigenvector_centrality",
+)
+
+
+# Betweenness and closeness are sampled above this many nodes
+EXACT_NODE_LIMIT = 1000
+DEFAULT_TARGET_ERROR = 0.1
+SAMPLE_SEED = 0  # Fixed so repeated refreshes of the same graph agree
+# How long quitting waits for a cancelled job; library kernels such as
+# NetworkX betweenness cannot be interrupted and may run much longer
+SHUTDOWN_TIMEOUT_MS = 500
+
+
+def sample_size(num_nodes, target_error=DEFAULT_TARGET_ERROR):
+    """Number of pivots needed for approximate centralities, or None for exact values.
+
+    Uses the Eppstein-Wang bound: log(n) / error^2 pivots give every
+    estimate an additive error of about ``target_error`` with high probability.
+    """
+    if num_nodes <= EXACT_NODE_LIMIT:
+        return None
+    pivots = math.ceil(math.log(num_nodes) / target_error ** 2)
+    return pivots if pivots < num_nodes else None
+
+
+def compute_metrics(snapshot, pivots=None, backend="auto", is_cancelled=lambda: False):
+    """Yield (metric name, value) pairs for a GraphSnapshot.
+
+    With ``pivots`` set, betweenness and closeness are estimated from that
+    many sampled source nodes instead of all of them. Each metric is computed
+    by the backend returned by select_backend(); ``backend`` names the one
+    the user prefers, or "auto".
+    ``is_cancelled`` is polled between metrics so a stale computation can
+    stop early instead of running every algorithm to completion.
+    """
+    nodes = snapshot.nodes
+    sampled = pivots is not None
+    capabilities = {
+        "distances": "eccentricities",
+        "degree_centrality": "degree_centrality",
+        "betweenness_centrality": "approximate_betweenness" if sampled else "betweenness_centrality",
+        "closeness_centrality": "approximate_closeness" if sampled else "closeness_centrality",
+        "eigenvector_centrality": "eigenvector_centrality",
+    }
+    selected = {
+        metric: select_backend(capability, len(nodes), backend)
+        for metric, capability in capabilities.items()
+    }
+    instances = {}
+
+    def backend_for(metric):
+        # One instance per backend, so shared work (like a BFS sweep) is reused
+        cls = selected[metric]
+        if cls.name not in instances:
+            instances[cls.name] = cls(snapshot)
+        return instances[cls.name]
+
+    yield "sampling", pivots
+    yield "backends", {metric: cls.label for metric, cls in selected.items()}
+
+    # Exact mode runs one BFS per node where the backend shares it with
+    # closeness; sampled mode only needs the eccentricities, which the
+    # bounding algorithm settles per component with far fewer BFS runs
+    eccentricity = None
+    if not sampled:
+        eccentricity = backend_for("distances").eccentricities(True, is_cancelled)
+        if eccentricity is None:
+            return
+    distances = component_distances(snapshot, backend, eccentricity, is_cancelled)
+    if distances is None:
+        return
+    yield "distances", distances
+    if is_cancelled():
+        return
+
+    yield "degree_centrality", backend_for("degree_centrality").degree_centrality()
+    if is_cancelled():
+        return
+
+    betweenness = backend_for("betweenness_centrality").betweenness_centrality(pivots, SAMPLE_SEED, is_cancelled)
+    if betweenness is None:
+        return
+    yield "betweenness_centrality", betweenness
+    if is_cancelled():
+        return
+
+    closeness = backend_for("closeness_centrality").closeness_centrality(pivots, SAMPLE_SEED, is_cancelled)
+    if closeness is None:
+        return
+    yield "closeness_centrality", closeness
+    if is_cancelled():
+        return
+
+    try:
+        eigenvector_cent = backend_for("eigenvector_centrality").eigenvector_centrality()
+    except Exception:
+        eigenvector_cent = {node: 0 for node in nodes}
+    yield "eigenvector_centrality", eigenvector_cent
+
+
+class MetricsCache:
+    """Bounded LRU cache of complete metric results keyed by graph topology."""
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, topology_key, pivots, backend):
+        # Exact results are also good enough when sampled ones are requested
+        for key in ((topology_key, pivots, backend), (topology_key, None, backend)):
+            results = self._entries.get(key)
+            if results is not None:
+                self._entries.move_to_end(key)
+                return results
+        return None
+
+    def put(self, topology_key, pivots, backend, results):
+        key = (topology_key, pivots, backend)
+        self._entries[key] = results
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class _JobSignals(QObject):
+    metricReady = pyqtSignal(int, str, object)
+    failed = pyqtSignal(int, str)
+    finished = pyqtSignal(int)
+
+
+class MetricsJob(QRunnable):
+    def __init__(self, version, snapshot, pivots=None, backend="auto"):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.version = version
+        self.snapshot = snapshot
+        self.pivots = pivots
+        self.backend = backend
+        self.cancelled = False
+        self.signals = _JobSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            for name, value in compute_metrics(self.snapshot, self.pivots, self.backend, lambda: self.cancelled):
+                if self.cancelled:
+                    break
+                self.signals.metricReady.emit(self.version, name, value)
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(self.version, str(e))
+        self.signals.finished.emit(self.version)
+
+
+class MetricsEngine(QObject):
+    """Runs metric computations on a worker thread.
+
+    Every submission gets a new version number; results from older versions
+    are dropped, so only the latest graph ever reaches the UI. Complete results
+    are cached by topology, so resubmitting a graph whose nodes and edges were
+    already seen (after a move, a restyle or an undone edit) is answered at once.
+    """
+    metricReady = pyqtSignal(int, str, object)  # version, metric name, value
+    computationFailed = pyqtSignal(int, str)
+    computationFinished = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._version = 0
+        self._jobs = {}  # Keep running jobs alive until they report back
+        self._partial = {}  # version -> results collected so far
+        self.cache = MetricsCache()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    @property
+    def version(self):
+        return self._version
+
+    def submit(self, snapshot, exact=False, target_error=DEFAULT_TARGET_ERROR, backend="auto"):
+        """Start computing metrics for ``snapshot``, superseding any previous job.
+
+        Unless ``exact`` is set, large graphs get sampled betweenness and
+        closeness sized for ``target_error``.
+        """
+        self.cancel()
+
+        pivots = None if exact else sample_size(snapshot.num_nodes, target_error)
+        cached = self.cache.get(snapshot.topology_key, pivots, backend)
+        if cached is not None:
+            for name, value in cached.items():
+                self.metricReady.emit(self._version, name, value)
+            self.computationFinished.emit(self._version)
+            return self._version
+
+        job = MetricsJob(self._version, snapshot, pivots, backend)
+        job.signals.metricReady.connect(self._on_metric_ready)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.finished.connect(self._on_finished)
+        self._jobs[job.version] = job
+        self._pool.start(job)
+        return job.version
+
+    def cancel(self):
+        # Invalidate outstanding results, drop queued jobs and ask the
+        # running one to stop at its next checkpoint
+        self._version += 1
+        for version, job in list(self._jobs.items()):
+            job.cancel()
+            if self._pool.tryTake(job):
+                del self._jobs[version]
+
+    def shutdown(self):
+        """Stop outstanding jobs and wait for the worker thread, before the application quits."""
+        self.cancel()
+        if not self._pool.waitForDone(SHUTDOWN_TIMEOUT_MS):
+            # Leave the job to die with the process; deleting the pool would
+            # wait for it again
+            self._pool.setParent(None)
+            sip.transferto(self._pool, None)
+
+    def _on_metric_ready(self, version, name, value):
+        # Stale jobs may still finish and are worth caching
+        self._partial.setdefault(version, {})[name] = value
+        if version == self._version:
+            self.metricReady.emit(version, name, value)
+
+    def _on_failed(self, version, message):
+        if version == self._version:
+            self.computationFailed.emit(version, message)
+
+    def _on_finished(self, version):
+        job = self._jobs.pop(version, None)
+        results = self._partial.pop(version, {})
+        if job is not None and len(results) == len(METRIC_NAMES):
+            self.cache.put(job.snapshot.topology_key, job.pivots, job.backend, results)
+        if version == self._version:
+            self.computationFinished.emit(version)
@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import wait, FIRST_COMPLETED
+from utils.worker_pool import WORKERS_AVAILABLE, get_pool
+
+try:
+    import numpy as np
+    from multiprocessing import shared_memory
+    PARALLEL_AVAILABLE = WORKERS_AVAILABLE
+except ImportError:
+    PARALLEL_AVAILABLE = False
+
+# Sources per task; several tasks per worker keep the load balanced
+CHUNKS_PER_WORKER = 4
+
+_attached = {}  # Worker side: shared memory name -> (handles, indptr, indices)
+
+
+def _share(array):
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block
+
+
+def _attach(indptr_spec, indices_spec):
+    key = (indptr_spec[0], indices_spec[0])
+    if key not in _attached:
+        # Only the most recent graph is kept attached in each worker
+        for handles, _, _ in _attached.values():
+            for handle in handles:
+                handle.close()
+        _attached.clear()
+        arrays = []
+        handles = []
+        for name, length, dtype in (indptr_spec, indices_spec):
+            handle = shared_memory.SharedMemory(name=name)
+            handles.append(handle)
+            arrays.append(np.ndarray((length,), dtype=dtype, buffer=handle.buf))
+        _attached[key] = (handles, arrays[0], arrays[1])
+    _, indptr, indices = _attached[key]
+    return indptr, indices
+
+
+def brandes_dependencies(indptr, indices, sources):
+    """Sum of Brandes dependency vectors over ``sources``.
+
+    Each BFS runs level by level with vectorized frontier expansion, then
+    accumulates dependencies back along the shortest-path DAG.
+    """
+    n = len(indptr) - 1
+    betweenness = np.zeros(n)
+    for source in sources:
+        distance = np.full(n, -1, dtype=np.int64)
+        sigma = np.zeros(n)
+        distance[source] = 0
+        sigma[source] = 1
+        frontier = np.array([source], dtype=indices.dtype)
+        depth = 0
+        dag_levels = []
+
+        while len(frontier):
+            starts = indptr[frontier]
+            counts = indptr[frontier + 1] - starts
+            total = int(counts.sum())
+            if total == 0:
+                break
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+            neighbors = indices[offsets]
+            parents = np.repeat(frontier, counts)
+
+            next_frontier = np.unique(neighbors[distance[neighbors] < 0])
+            distance[next_frontier] = depth + 1
+            on_dag = distance[neighbors] == depth + 1
+            parents, children = parents[on_dag], neighbors[on_dag]
+            np.add.at(sigma, children, sigma[parents])
+            dag_levels.append((parents, children))
+            frontier = next_frontier
+            depth += 1
+
+        delta = np.zeros(n)
+        for parents, children in reversed(dag_levels):
+            np.add.at(delta, parents, sigma[parents] / sigma[children] * (1 + delta[children]))
+        delta[source] = 0
+        betweenness += delta
+    return betweenness
+
+
+def csr_from_snapshot(snapshot):
+    """Symmetric CSR adjacency (indptr, indices) of a GraphSnapshot, nodes in snapshot order."""
+    n = len(snapshot.nodes)
+    index = {node_id: i for i, node_id in enumerate(snapshot.nodes)}
+    sources = np.fromiter((index[source] for source, _ in snapshot.edges), dtype=np.int32, count=len(snapshot.edges))
+    targets = np.fromiter((index[target] for _, target in snapshot.edges), dtype=np.int32, count=len(snapshot.edges))
+    rows = np.concatenate([sources, targets])
+    cols = np.concatenate([targets, sources])
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order]
+
+
+def _betweenness_task(indptr_spec, indices_spec, sources):
+    indptr, indices = _attach(indptr_spec, indices_spec)
+    return brandes_dependencies(indptr, indices, sources)
+
+
+def parallel_betweenness(indptr, indices, is_cancelled=lambda: False):
+    """Exact, normalized betweenness centrality of an undirected CSR graph.
+
+    Source vertices are partitioned across a process pool. Workers read the
+    adjacency from shared memory instead of receiving a pickled copy, and
+    their partial dependency vectors are summed here. Returns a numpy array,
+    or None if cancelled.
+    """
+    n = len(indptr) - 1
+    blocks = [_share(indptr), _share(indices)]
+    try:
+        indptr_spec = (blocks[0].name, len(indptr), indptr.dtype.str)
+        indices_spec = (blocks[1].name, len(indices), indices.dtype.str)
+        pool = get_pool()
+        chunk_count = max(1, min(n, (os.cpu_count() or 1) * CHUNKS_PER_WORKER))
+        pending = {
+            pool.submit(_betweenness_task, indptr_spec, indices_spec, chunk)
+            for chunk in np.array_split(np.arange(n), chunk_count) if len(chunk)
+        }
+
+        betweenness = np.zeros(n)
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                betweenness += future.result()
+            if is_cancelled():
+                for future in pending:
+                    future.cancel()
+                return None
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    # Same scaling as networkx.betweenness_centrality(normalized=True)
+    if n > 2:
+        betweenness /= (n - 1) * (n - 2)
+    return betweenness
@@ -0,0 +1,141 @@
+import random
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    from scipy.sparse import csgraph
+    from scipy.sparse.linalg import eigsh
+    SPARSE_AVAILABLE = True
+except ImportError:
+    SPARSE_AVAILABLE = False
+
+# Upper bound on the entries of one block of the distance matrix
+DISTANCE_BLOCK_ENTRIES = 4_000_000
+
+
+class SparseGraph:
+    """CSR adjacency of a GraphSnapshot with vectorized metric computations.
+
+    The matrix is built once per snapshot; every method returns plain Python
+    values keyed by node id, like the NetworkX code path.
+    """
+    def __init__(self, snapshot):
+        if not SPARSE_AVAILABLE:
+            raise ImportError("NumPy and SciPy are required for the sparse metrics backend")
+        self.nodes = snapshot.nodes
+        self.n = len(self.nodes)
+        index = {node_id: i for i, node_id in enumerate(self.nodes)}
+        rows = np.fromiter((index[source] for source, _ in snapshot.edges), dtype=np.int32, count=len(snapshot.edges))
+        cols = np.fromiter((index[target] for _, target in snapshot.edges), dtype=np.int32, count=len(snapshot.edges))
+        data = np.ones(2 * len(rows), dtype=np.float64)
+        self.A = sp.csr_matrix(
+            (data, (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+            shape=(self.n, self.n),
+        )
+        self.degrees = np.diff(self.A.indptr)
+        self._components = None
+
+    def _as_dict(self, values):
+        return dict(zip(self.nodes, values.tolist()))
+
+    def components(self):
+        """Return (component count, component label per node)."""
+        if self._components is None:
+            self._components = csgraph.connected_components(self.A, directed=False)
+        return self._components
+
+    def degree_centrality(self):
+        if self.n <= 1:
+            return self._as_dict(np.ones(self.n))
+        return self._as_dict(self.degrees / (self.n - 1))
+
+    def _distance_blocks(self, sources, is_cancelled):
+        block = max(1, DISTANCE_BLOCK_ENTRIES // max(self.n, 1))
+        for start in range(0, len(sources), block):
+            if is_cancelled():
+                return
+            chunk = sources[start:start + block]
+            yield chunk, csgraph.shortest_path(self.A, directed=False, unweighted=True, indices=chunk)
+
+    def distance_sweep(self, is_cancelled=lambda: False):
+        """Vectorized counterpart of distance_metrics.distance_sweep."""
+        eccentricity = np.zeros(self.n, dtype=np.int64)
+        distance_sums = np.zeros(self.n, dtype=np.int64)
+        reachable = np.zeros(self.n, dtype=np.int64)
+        for chunk, distances in self._distance_blocks(np.arange(self.n), is_cancelled):
+            finite = np.isfinite(distances)
+            distances = np.where(finite, distances, 0)
+            eccentricity[chunk] = distances.max(axis=1)
+            distance_sums[chunk] = distances.sum(axis=1)
+            reachable[chunk] = finite.sum(axis=1)
+        if is_cancelled():
+            return None
+        return self._as_dict(eccentricity), self._as_dict(distance_sums), self._as_dict(reachable)
+
+    def bounded_eccentricities(self, is_cancelled=lambda: False):
+        """Vectorized Takes-Kosters eccentricities of a connected graph."""
+        lower = np.zeros(self.n, dtype=np.int64)
+        upper = np.full(self.n, np.iinfo(np.int64).max)
+        eccentricity = np.full(self.n, -1, dtype=np.int64)
+        pick_upper = False
+        while (eccentricity < 0).any():
+            if is_cancelled():
+                return None
+            open_nodes = np.flatnonzero(eccentricity < 0)
+            if pick_upper:
+                source = open_nodes[np.lexsort((self.degrees[open_nodes], upper[open_nodes]))[-1]]
+            else:
+                source = open_nodes[np.lexsort((-self.degrees[open_nodes], lower[open_nodes]))[0]]
+            pick_upper = not pick_upper
+
+            distances = csgraph.shortest_path(self.A, directed=False, unweighted=True, indices=source).astype(np.int64)
+            source_ecc = distances.max()
+            eccentricity[source] = source_ecc
+            lower[open_nodes] = np.maximum(lower[open_nodes], np.maximum(distances[open_nodes], source_ecc - distances[open_nodes]))
+            upper[open_nodes] = np.minimum(upper[open_nodes], source_ecc + distances[open_nodes])
+            settled = open_nodes[lower[open_nodes] == upper[open_nodes]]
+            eccentricity[settled] = lower[settled]
+        return self._as_dict(eccentricity)
+
+    def approximate_closeness_centrality(self, pivots, seed):
+        """Vectorized counterpart of metrics_engine.approximate_closeness_centrality."""
+        sampled = np.array(sorted(random.Random(seed).sample(range(self.n), pivots)))
+        distance_sums = np.zeros(self.n)
+        pivot_counts = np.zeros(self.n, dtype=np.int64)
+        for _, distances in self._distance_blocks(sampled, lambda: False):
+            finite = np.isfinite(distances)
+            distance_sums += np.where(finite, distances, 0).sum(axis=0)
+            pivot_counts += finite.sum(axis=0)
+
+        _, labels = self.components()
+        component_sizes = np.bincount(labels)[labels]
+        others = pivot_counts.copy()
+        others[sampled] -= 1
+
+        closeness = np.zeros(self.n)
+        estimated = others > 0
+        totals = distance_sums[estimated] * (component_sizes[estimated] - 1) / others[estimated]
+        found = component_sizes[estimated] - 1
+        closeness[estimated] = np.divide(found, totals, out=np.zeros(len(totals)), where=totals > 0) * found / max(self.n - 1, 1)
+
+        # Nodes sharing no pivot with any other node are measured exactly
+        missing = np.flatnonzero(~estimated)
+        for chunk, distances in self._distance_blocks(missing, lambda: False):
+            finite = np.isfinite(distances)
+            total = np.where(finite, distances, 0).sum(axis=1)
+            found = finite.sum(axis=1) - 1
+            closeness[chunk] = np.divide(found, total, out=np.zeros(len(chunk)), where=total > 0) * found / max(self.n - 1, 1)
+        return self._as_dict(closeness)
+
+    def eigenvector_centrality(self):
+        if self.A.nnz == 0:
+            return self._as_dict(np.zeros(self.n))
+        if self.n < 3:
+            _, vectors = np.linalg.eigh(self.A.toarray())
+            vector = vectors[:, -1]
+        else:
+            _, vectors = eigsh(self.A, k=1, which="LA")
+            vector = vectors[:, 0]
+        # Principal eigenvector is defined up to sign; NetworkX reports it positive with unit norm
+        vector = np.abs(vector)
+        return self._as_dict(vector / np.linalg.norm(vector))
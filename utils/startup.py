@@ -0,0 +1,108 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Seconds a fresh interpreter may spend importing the application
+STARTUP_BUDGET = 1.5
+# Seconds from process start to the first paint of the main window
+FIRST_PAINT_BUDGET = 2.0
+# Libraries that only importers, metric backends and the metrics tab need;
+# none of them may be imported while the application starts
+DEFERRED_MODULES = ("networkx", "graph_tool", "igraph", "pyvis", "pygraphviz", "dgl", "torch", "snap")
+# Runs per measurement; the fastest one is reported, as the others only add noise
+REPEATS = 3
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(' '.join(sorted({{name.split('.')[0] for name in sys.modules}} & set(sys.argv[1:]))))
+"""
+
+
+class StartupProfile:
+    """Wall-clock duration of each startup phase, for main.py --profile-startup."""
+    def __init__(self, start):
+        self.start = start
+        self.last = start
+        self.phases = []
+
+    def mark(self, phase):
+        """End ``phase`` now; it started where the previous one ended."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self, file=sys.stderr):
+        elapsed = 0.0
+        first_paint = None
+        for phase, seconds in self.phases:
+            elapsed += seconds
+            print(f"{phase:<14}{seconds * 1000:9.1f} ms", file=file)
+            if phase == "first paint":
+                first_paint = elapsed
+        print(f"{'total':<14}{elapsed * 1000:9.1f} ms", file=file)
+        if first_paint is not None and first_paint > FIRST_PAINT_BUDGET:
+            print(f"first paint is over the {FIRST_PAINT_BUDGET:.1f} s budget", file=file)
+
+
+def measure_import(module="main", repeats=REPEATS):
+    """Time importing ``module`` in fresh interpreters.
+
+    Returns (fastest time in seconds, deferred modules it imported).
+    """
+    times = []
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module), *DEFERRED_MODULES],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        elapsed, _, loaded = result.stdout.strip().partition("\n")
+        times.append(float(elapsed))
+    return min(times), loaded.split()
+
+
+def slowest_imports(module="main", count=10):
+    """The ``count`` modules with the largest cumulative import time, as (seconds, name)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            entries.append((int(fields[1]) / 1e6, fields[2].strip()))
+    return sorted(entries, reverse=True)[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the application's import time against a budget.")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET, help="seconds allowed")
+    parser.add_argument("--module", default="main", help="module to import")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest imports")
+    args = parser.parse_args(argv)
+
+    elapsed, loaded = measure_import(args.module, args.repeats)
+    print(f"import {args.module}: {elapsed:.3f}s (budget {args.budget:.3f}s)")
+    for seconds, name in slowest_imports(args.module, args.top) if args.top else ():
+        print(f"  {seconds:8.3f}s  {name}")
+
+    failed = False
+    if elapsed > args.budget:
+        print("FAIL: startup is over budget")
+        failed = True
+    if loaded:
+        print(f"FAIL: imported at startup: {', '.join(loaded)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
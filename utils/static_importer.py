@@ -0,0 +1,283 @@
+import ast
+
+# Functions the evaluator may call; all are pure and only see literal values
+SAFE_BUILTINS = {
+    "int": int, "float": float, "str": str, "len": len,
+    "zip": zip, "dict": dict, "list": list, "tuple": tuple, "range": range,
+}
+# Calls that construct the graph object itself
+CONSTRUCTORS = {"Graph", "AGraph", "Network", "New", "graph"}
+# Calls that only draw or show the graph
+IGNORED_CALLS = {"draw", "show", "layout"}
+
+
+class Unsupported(Exception):
+    """Raised for code the static reader does not understand."""
+
+
+class _VertexProperty:
+    def __init__(self, kind):
+        self.kind = kind
+
+
+class _NodeHandle:
+    # What G.get_node(node) returns: a node whose attributes may be assigned
+    def __init__(self, key):
+        self.key = key
+
+
+class StaticGraph:
+    """Nodes, edges and positions read from exported code without running it.
+
+    Node keys are whatever the code uses to name nodes: ids for NetworkX,
+    PyVis and PyGraphviz, vertex indices for igraph, graph-tool and DGL.
+    """
+    def __init__(self):
+        self.nodes = {}  # Node key -> (x, y) or None, in insertion order
+        self.edges = []
+        self.names = {}  # Vertex name -> index, for edges given by name
+        self.simple = False  # Parallel edges collapse, as in nx.Graph
+
+    def add_node(self, key, position=None):
+        if position is not None or key not in self.nodes:
+            self.nodes[key] = position
+
+    def add_vertices(self, count):
+        start = len(self.nodes)
+        for index in range(start, start + count):
+            self.add_node(index)
+        return start
+
+    def add_edge(self, source, target):
+        endpoints = []
+        for key in (source, target):
+            if key not in self.nodes:
+                key = self.names.get(key, key)
+                self.add_node(key)
+            endpoints.append(key)
+        self.edges.append(tuple(endpoints))
+
+    def positions(self):
+        """Positions aligned with the nodes, or None if some node has none."""
+        positions = list(self.nodes.values())
+        return None if None in positions else positions
+
+    def index_edges(self):
+        """Edges as pairs of node positions in ``nodes``."""
+        index = {key: i for i, key in enumerate(self.nodes)}
+        edges = ((index[source], index[target]) for source, target in self.edges)
+        if self.simple:
+            edges = dict.fromkeys(tuple(sorted(edge)) for edge in edges)
+        return list(edges)
+
+
+def _position(value):
+    # (x, y), [x, y] or a Graphviz "x,y!" string
+    if isinstance(value, str):
+        value = value.rstrip("!").split(",")
+    x, y = value[0], value[1]
+    return float(x), float(y)
+
+
+def _evaluate(node, env):
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, (ast.List, ast.Tuple)):
+        items = [_evaluate(item, env) for item in node.elts]
+        return items if isinstance(node, ast.List) else tuple(items)
+    if isinstance(node, ast.Dict):
+        if None in node.keys:
+            raise Unsupported("dict unpacking")
+        return {_evaluate(key, env): _evaluate(value, env) for key, value in zip(node.keys, node.values)}
+    if isinstance(node, ast.Name):
+        if node.id not in env:
+            raise Unsupported(f"unknown name '{node.id}'")
+        return env[node.id]
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _evaluate(node.operand, env)
+        return -value if isinstance(node.op, ast.USub) else +value
+    if isinstance(node, ast.Subscript):
+        return _evaluate(node.value, env)[_evaluate(node.slice, env)]
+    if isinstance(node, ast.Slice):
+        return slice(*(None if part is None else _evaluate(part, env) for part in (node.lower, node.upper, node.step)))
+    if isinstance(node, ast.Attribute) and node.attr == "T":
+        # Transpose of a list of pairs, as for torch tensors
+        return tuple(list(column) for column in zip(*_evaluate(node.value, env)))
+    if isinstance(node, ast.Call):
+        args = [_evaluate(arg, env) for arg in node.args]
+        if isinstance(node.func, ast.Name) and node.func.id in SAFE_BUILTINS and node.func.id not in env:
+            return SAFE_BUILTINS[node.func.id](*args)
+        if isinstance(node.func, ast.Attribute) and node.func.attr == "tensor":
+            return args[0]
+        if isinstance(node.func, ast.Attribute) and node.func.attr == "reshape" and args[-1:] == [2]:
+            values = _evaluate(node.func.value, env)
+            if values and not isinstance(values[0], (list, tuple)):
+                values = list(zip(values[::2], values[1::2]))
+            return values
+    raise Unsupported(ast.dump(node)[:80])
+
+
+class _Reader:
+    def __init__(self):
+        self.graph = StaticGraph()
+        self.env = {}
+
+    def run(self, statements):
+        for statement in statements:
+            if isinstance(statement, (ast.Import, ast.ImportFrom, ast.Pass)):
+                continue
+            if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Call):
+                self.call(statement.value)
+            elif isinstance(statement, ast.Assign) and len(statement.targets) == 1:
+                self.assign(statement.targets[0], statement.value)
+            elif isinstance(statement, ast.For) and not statement.orelse:
+                for item in _evaluate(statement.iter, self.env):
+                    self.bind(statement.target, item)
+                    self.run(statement.body)
+            else:
+                raise Unsupported(type(statement).__name__)
+
+    def bind(self, target, value):
+        if isinstance(target, ast.Name):
+            self.env[target.id] = value
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            values = list(value)
+            if len(values) != len(target.elts):
+                raise Unsupported("unpacking mismatch")
+            for element, item in zip(target.elts, values):
+                self.bind(element, item)
+        else:
+            raise Unsupported("assignment target")
+
+    def call(self, call):
+        """Apply a graph method call; returns what the code would bind to its result."""
+        if not isinstance(call.func, ast.Attribute):
+            raise Unsupported("call")
+        method = call.func.attr
+        if method in IGNORED_CALLS:
+            return None
+        if method == "get_node":
+            return _NodeHandle(_evaluate(call.args[0], self.env))
+        graph = self.graph
+        args = [_evaluate(arg, self.env) for arg in call.args]
+        kwargs = {keyword.arg: _evaluate(keyword.value, self.env) for keyword in call.keywords if keyword.arg}
+
+        if method in ("add_node", "AddNode"):
+            position = None
+            if "pos" in kwargs:
+                position = _position(kwargs["pos"])
+            elif "x" in kwargs and "y" in kwargs:
+                position = (float(kwargs["x"]), float(kwargs["y"]))
+            graph.add_node(args[0], position)
+        elif method in ("add_nodes_from", "add_nodes"):
+            xs, ys = kwargs.get("x"), kwargs.get("y")
+            for i, key in enumerate(args[0]):
+                graph.add_node(key, None if xs is None or ys is None else (float(xs[i]), float(ys[i])))
+        elif method in ("add_vertices", "add_vertex"):
+            start = graph.add_vertices(args[0] if args else 1)
+            return start
+        elif method in ("add_edge", "AddEdge"):
+            graph.add_edge(args[0], args[1])
+        elif method in ("add_edges_from", "add_edges", "add_edge_list"):
+            for source, target in args[0]:
+                graph.add_edge(source, target)
+        elif method == "new_vertex_property":
+            prop = _VertexProperty(args[0])
+            for index, value in enumerate(kwargs.get("vals", ())):
+                self.set_property(prop, index, value)
+            return prop
+        else:
+            raise Unsupported(f"method '{method}'")
+        return None
+
+    def construct(self, call):
+        graph = self.graph
+        name = call.func.attr if isinstance(call.func, ast.Attribute) else call.func.id
+        # nx.Graph() is the only simple graph the exporters create
+        if name == "Graph" and isinstance(call.func, ast.Attribute) and getattr(call.func.value, "id", None) in ("nx", "networkx"):
+            graph.simple = True
+        kwargs = {keyword.arg: _evaluate(keyword.value, self.env) for keyword in call.keywords if keyword.arg}
+        if name == "graph" and call.args:
+            # dgl.graph((src, dst), num_nodes=n)
+            sources, targets = _evaluate(call.args[0], self.env)
+            count = kwargs.get("num_nodes", max(list(sources) + list(targets), default=-1) + 1)
+            graph.add_vertices(count)
+            for source, target in zip(sources, targets):
+                graph.add_edge(source, target)
+        elif name == "Graph" and ("n" in kwargs or "edges" in kwargs):
+            # ig.Graph(n=..., edges=[...])
+            graph.add_vertices(kwargs.get("n", 0))
+            for source, target in kwargs.get("edges", ()):
+                graph.add_edge(source, target)
+
+    def set_property(self, prop, index, value):
+        if prop.kind == "string":
+            self.graph.names[value] = index
+        elif prop.kind == "vector<double>":
+            self.graph.add_node(index, _position(value))
+
+    def assign(self, target, value):
+        if isinstance(value, ast.Call):
+            func = value.func
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            if name in CONSTRUCTORS and not (isinstance(func, ast.Name) and name in self.env):
+                self.construct(value)
+                self.bind(target, None)
+                return
+            if isinstance(func, ast.Attribute) and name not in ("tensor", "reshape"):
+                self.bind(target, self.call(value))
+                return
+        if isinstance(target, ast.Subscript):
+            self.assign_item(target, _evaluate(value, self.env))
+            return
+        self.bind(target, _evaluate(value, self.env))
+
+    def assign_item(self, target, value):
+        key = _evaluate(target.slice, self.env)
+        owner = target.value
+        # g.vs['name'] = [...]
+        if isinstance(owner, ast.Attribute) and owner.attr == "vs" and key == "name":
+            for index, name in enumerate(value):
+                self.graph.names[name] = index
+            return
+        # G.get_node(node).attr['pos'] = "x,y!"
+        if isinstance(owner, ast.Attribute) and owner.attr == "attr" and isinstance(owner.value, ast.Call):
+            handle = self.call(owner.value)
+            if isinstance(handle, _NodeHandle) and key == "pos":
+                self.graph.add_node(handle.key, _position(value))
+                return
+            raise Unsupported("node attribute")
+        container = _evaluate(owner, self.env)
+        if isinstance(container, _VertexProperty):
+            self.set_property(container, key, value)
+        elif isinstance(container, (dict, list)):
+            container[key] = value
+        else:
+            raise Unsupported("item assignment")
+
+
+def extract_graph(tree):
+    """Read the graph built by ``tree`` (a parsed module) without executing it.
+
+    Understands the statements the exporters generate, in both statement and
+    compact mode. Returns a StaticGraph, or None if the code does anything
+    else, in which case it has to be run instead.
+    """
+    reader = _Reader()
+    try:
+        reader.run(tree.body)
+    except (Unsupported, LookupError, TypeError, ValueError, AttributeError):
+        return None
+    graph = reader.graph
+    if not graph.nodes:
+        return None
+    # Layouts kept in variables rather than on the graph
+    pos, layout = reader.env.get("pos"), reader.env.get("layout")
+    if isinstance(pos, dict):
+        for key, value in pos.items():
+            if key in graph.nodes:
+                graph.nodes[key] = _position(value)
+    elif isinstance(layout, (list, tuple)) and len(layout) == len(graph.nodes):
+        for key, value in zip(graph.nodes, layout):
+            graph.nodes[key] = _position(value)
+    return graph
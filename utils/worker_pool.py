@@ -0,0 +1,27 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Worker processes only pay off when there is more than one core to run them
+WORKERS_AVAILABLE = (os.cpu_count() or 1) > 1
+
+_pool = None
+
+
+def get_pool():
+    """Process pool shared by all parallel metric computations, started on first use."""
+    global _pool
+    if _pool is None:
+        # Spawned workers do not inherit the GUI process's threads or Qt state
+        _pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
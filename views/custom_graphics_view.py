@@ -3,10 +3,13 @@ from PyQt6.QtCore import Qt, QPointF
 from PyQt6.QtGui import QPainter, QCursor
 
 class CustomGraphicsView(QGraphicsView):
+    ANTIALIASING_MIN_SCALE = 0.5  # Antialiasing is turned off when zoomed out further
+
     def __init__(self, scene):
         super().__init__(scene)
         self.setRenderHint(QPainter.RenderHint.Antialiasing)
-        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        # Repaint only the area covering changed items instead of the whole viewport
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.BoundingRectViewportUpdate)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
         self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
@@ -62,6 +65,14 @@ class CustomGraphicsView(QGraphicsView):
         newPos = self.mapToScene(event.position().toPoint())
         delta = newPos - oldPos
         self.translate(delta.x(), delta.y())
+        self.update_level_of_detail()
+
+    def update_level_of_detail(self):
+        # Items pick their own detail level while painting; the view only
+        # decides whether antialiasing is worth its cost at this scale
+        antialiasing = self.transform().m11() >= self.ANTIALIASING_MIN_SCALE
+        if antialiasing != bool(self.renderHints() & QPainter.RenderHint.Antialiasing):
+            self.setRenderHint(QPainter.RenderHint.Antialiasing, antialiasing)
         
     def enterEvent(self, event):
         super().enterEvent(event)
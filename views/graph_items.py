@@ -0,0 +1,160 @@
+from PyQt6.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt6.QtCore import Qt, QRectF, QLineF
+from PyQt6.QtGui import QPen, QBrush, QColor, QFont, QFontMetricsF, QPainterPath, QPainterPathStroker
+
+# Level-of-detail thresholds, as the on-screen scale of one scene unit
+LABEL_MIN_LOD = 0.4  # Below this node labels are not drawn
+DETAIL_MIN_LOD = 0.15  # Below this nodes are drawn as plain squares and edges as hairlines
+# Outline shared by all nodes; it is never changed in place
+NODE_PEN = QPen(Qt.GlobalColor.black)
+
+
+class NodeItem(QGraphicsItem):
+    """Single scene item drawing a node's circle and its label.
+
+    The item is positioned at the node center, so moving a node is a plain
+    setPos() and never invalidates the cached bounding rect.
+    """
+    Type = QGraphicsItem.UserType + 1
+
+    def __init__(self, node, font=None, metrics=None):
+        super().__init__()
+        self.node = node
+        self._pen = NODE_PEN
+        self._brush = QBrush(node.color)
+        self._label_color = QColor(Qt.GlobalColor.black)
+        # Bulk loads share one font, and its metrics, between all nodes of a size;
+        # set_radius() replaces the font rather than changing the shared one
+        self._font = QFont() if font is None else font
+        self._shape = None
+        self.setZValue(1)  # Draw nodes above edges
+        self.setPos(node.pos)
+        self._update_geometry(metrics)
+
+    def type(self):
+        return NodeItem.Type
+
+    def _update_geometry(self, metrics=None):
+        self.prepareGeometryChange()
+        half_pen = self._pen.widthF() / 2
+        if metrics is None:
+            metrics = QFontMetricsF(self._font)
+        label_rect = metrics.boundingRect(self.node.id)
+        r = self.node.radius
+        self._circle = QRectF(-r, -r, 2 * r, 2 * r)
+        label_rect.moveCenter(self._circle.center())
+        self._bounding_rect = self._circle.adjusted(-half_pen, -half_pen, half_pen, half_pen).united(label_rect)
+        self._shape = None
+
+    def boundingRect(self):
+        return self._bounding_rect
+
+    def shape(self):
+        if self._shape is None:
+            self._shape = QPainterPath()
+            self._shape.addEllipse(self._circle)
+        return self._shape
+
+    def set_center(self, pos):
+        self.setPos(pos)
+
+    def set_radius(self, radius):
+        self.node.radius = radius
+        self._font = QFont(self._font)
+        self._font.setPointSize(int(radius / 2))
+        self._update_geometry()
+
+    def brush(self):
+        return QBrush(self._brush)
+
+    def setBrush(self, brush):
+        self._brush = QBrush(brush)
+        self.update()
+
+    def label_color(self):
+        return QColor(self._label_color)
+
+    def set_label_color(self, color):
+        self._label_color = QColor(color)
+        self.update()
+
+    def paint(self, painter, option, widget=None):
+        rect = self._circle
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < DETAIL_MIN_LOD:
+            # A few pixels wide at most: outline and curve are not visible anyway
+            painter.fillRect(rect, self._brush)
+            return
+
+        painter.setPen(self._pen)
+        painter.setBrush(self._brush)
+        painter.drawEllipse(rect)
+
+        if lod < LABEL_MIN_LOD:
+            return
+        painter.setPen(self._label_color)
+        painter.setFont(self._font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, self.node.id)
+
+
+class EdgeItem(QGraphicsItem):
+    """Straight line between two node centers, with cached geometry."""
+    Type = QGraphicsItem.UserType + 2
+
+    def __init__(self, edge, pen=None):
+        super().__init__()
+        self.edge = edge
+        self._line = QLineF(edge.source.pos, edge.target.pos)
+        # The pen is never changed in place, so bulk loads can share one
+        self._pen = QPen(edge.color) if pen is None else pen
+        self._shape = None
+        self._update_geometry()
+
+    def type(self):
+        return EdgeItem.Type
+
+    def _update_geometry(self):
+        self.prepareGeometryChange()
+        pen_width = max(self._pen.widthF(), 1)
+        line = self._line
+        x1, y1, x2, y2 = line.x1(), line.y1(), line.x2(), line.y2()
+        self._bounding_rect = QRectF(min(x1, x2) - pen_width / 2, min(y1, y2) - pen_width / 2,
+                                     abs(x2 - x1) + pen_width, abs(y2 - y1) + pen_width)
+        self._shape = None
+
+    def boundingRect(self):
+        return self._bounding_rect
+
+    def shape(self):
+        if self._shape is None:
+            path = QPainterPath(self._line.p1())
+            path.lineTo(self._line.p2())
+            stroker = QPainterPathStroker()
+            stroker.setWidth(max(self._pen.widthF(), 1))
+            self._shape = stroker.createStroke(path)
+        return self._shape
+
+    def line(self):
+        return QLineF(self._line)
+
+    def setLine(self, x1, y1, x2, y2):
+        self._line = QLineF(x1, y1, x2, y2)
+        self._update_geometry()
+
+    def pen(self):
+        return QPen(self._pen)
+
+    def setPen(self, pen):
+        self._pen = QPen(pen)
+        self._update_geometry()
+        self.update()
+
+    def paint(self, painter, option, widget=None):
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < DETAIL_MIN_LOD:
+            pen = QPen(self._pen)
+            pen.setWidth(0)  # Cosmetic one-pixel line
+            painter.setPen(pen)
+        else:
+            painter.setPen(self._pen)
+        painter.drawLine(self._line)
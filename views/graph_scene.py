@@ -1,15 +1,21 @@
+from contextlib import contextmanager
 from PyQt6.QtWidgets import QGraphicsScene, QMenu, QColorDialog, QInputDialog, QGraphicsView, QMessageBox, QApplication
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QPen
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QRectF
+from PyQt6.QtGui import QPen, QGuiApplication, QFont, QFontMetricsF
 from models.node import Node
 from models.edge import Edge
+from models.graph import GraphModel
+from views.graph_items import NodeItem, EdgeItem
 
 class GraphScene(QGraphicsScene):
     graphModified = pyqtSignal()  # New signal for graph modifications
+
+    DEFAULT_REFRESH_INTERVAL = 16  # ms, used when the screen refresh rate is unknown
     
     def __init__(self):
         super().__init__()
         self.nodes = {}
+        self.graph = GraphModel()  # Structure mirror consumed by metrics and exporters
         self.node_counter = 0
         self.selected_node = None
         self.mode = None 
@@ -17,14 +23,71 @@ class GraphScene(QGraphicsScene):
         self.last_pan_pos = None
         self.moving_node = None  # Track the node being moved
         self.menu_open = False
+        self._batch_depth = 0  # Nesting level of active batch() blocks
+        self._fixed_rect = False  # Scene rect set by bulk_load() rather than grown by Qt
+
+        # Pending refresh channels: topology changes need new metrics,
+        # geometry/style changes only need a new code preview
+        self._topology_dirty = False
+        self._geometry_dirty = False
+        self._refresh_timer = QTimer()
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self.flush_refresh)
         
     def set_metrics_callback(self, callback):
         self.metrics_callback = callback
         
-    def update_metrics(self):
-        if self.metrics_callback:
+    def update_metrics(self, topology=True):
+        """Mark the graph as modified and schedule a coalesced refresh.
+
+        Pass topology=False for changes that only affect positions or style,
+        so the metrics are not recomputed.
+        """
+        if topology:
+            self._topology_dirty = True
+        else:
+            self._geometry_dirty = True
+
+        if self._batch_depth > 0:
+            # Defer the refresh until the outermost batch ends
+            return
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start(self._refresh_interval())
+
+    def flush_refresh(self):
+        """Run any pending refresh immediately."""
+        self._refresh_timer.stop()
+        topology = self._topology_dirty
+        geometry = self._geometry_dirty
+        self._topology_dirty = False
+        self._geometry_dirty = False
+
+        if topology and self.metrics_callback:
             self.metrics_callback()
-        self.graphModified.emit()  # Emit signal when graph is modified
+        if topology or geometry:
+            self.graphModified.emit()  # Emit signal when graph is modified
+
+    def _refresh_interval(self):
+        # One refresh per display frame at most
+        screen = QGuiApplication.primaryScreen()
+        if screen is not None and screen.refreshRate() > 0:
+            return max(1, int(1000 / screen.refreshRate()))
+        return self.DEFAULT_REFRESH_INTERVAL
+
+    @contextmanager
+    def batch(self):
+        """Group many mutations into a single metrics refresh and graphModified emission.
+
+        Batches can be nested; the refresh happens when the outermost one ends,
+        and only if something inside actually changed the graph.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush_refresh()
 
     def add_node(self, pos):
         node_id = f"n{self.node_counter}"
@@ -32,46 +95,120 @@ class GraphScene(QGraphicsScene):
         node = Node(node_id, pos)
         
         # Create visual representation
-        ellipse = self.addEllipse(pos.x() - node.radius, pos.y() - node.radius, node.radius * 2, node.radius * 2, 
-                                QPen(Qt.GlobalColor.black), 
-                                node.color)
-        text = self.addText(node_id)
-        text.setPos(pos.x() - node.radius / 2, pos.y() - node.radius / 2)
-        text.setZValue(2)
+        item = NodeItem(node)
+        self.addItem(item)
         
         # Store node
-        node.graphics_item = ellipse
-        node.text_item = text
+        node.graphics_item = item
         self.nodes[node_id] = node
+        self.graph.add_node(node_id)
+        self._include_in_rect(item)
         
         self.update_metrics()
         return node
 
+    def bulk_load(self, positions, edges, radii=None, colors=None):
+        """Replace the scene contents with nodes at ``positions`` joined by ``edges``.
+
+        ``edges`` are pairs of indices into ``positions``; ``radii`` and
+        ``colors`` optionally give each node its size and fill. Items are
+        created with the BSP index switched off, sharing fonts and pens, the
+        graph model is built in one pass and the scene rect is set once, so
+        large imports do not pay for per-item bookkeeping. Returns the new nodes.
+        """
+        index_method = self.itemIndexMethod()
+        with self.batch():
+            self.clear_all()
+            self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+            try:
+                nodes = []
+                fonts = {}  # radius -> (font, metrics) shared by the nodes of that size
+                default_font = QFont()
+                default_metrics = QFontMetricsF(default_font)
+                left = top = float("inf")
+                right = bottom = float("-inf")
+                for i, pos in enumerate(positions):
+                    node = Node(f"n{self.node_counter}", pos)
+                    self.node_counter += 1
+                    if colors is not None:
+                        node.color = colors[i]
+                    font, metrics = default_font, default_metrics
+                    if radii is not None:
+                        node.radius = float(radii[i])
+                        if node.radius not in fonts:
+                            font = QFont()
+                            font.setPointSize(int(node.radius / 2))
+                            fonts[node.radius] = (font, QFontMetricsF(font))
+                        font, metrics = fonts[node.radius]
+                    item = NodeItem(node, font, metrics)
+                    self.addItem(item)
+                    node.graphics_item = item
+                    self.nodes[node.id] = node
+                    nodes.append(node)
+
+                    rect = item.boundingRect()
+                    left = min(left, pos.x() + rect.left())
+                    top = min(top, pos.y() + rect.top())
+                    right = max(right, pos.x() + rect.right())
+                    bottom = max(bottom, pos.y() + rect.bottom())
+
+                pen = None
+                node_edges = []
+                for source_index, target_index in edges:
+                    if source_index == target_index:
+                        continue
+                    source_node, target_node = nodes[source_index], nodes[target_index]
+                    edge = Edge(source_node, target_node)
+                    if pen is None:
+                        pen = QPen(edge.color)
+                    edge.graphics_item = EdgeItem(edge, pen)
+                    self.addItem(edge.graphics_item)
+                    source_node.edges.append(edge)
+                    target_node.edges.append(edge)
+                    node_edges.append((source_node.id, target_node.id))
+
+                self.graph.load([node.id for node in nodes], node_edges)
+                if nodes:
+                    # Edges lie between node centers, so the nodes bound everything
+                    self.setSceneRect(QRectF(left, top, right - left, bottom - top))
+                    self._fixed_rect = True
+            finally:
+                # The index is rebuilt once, from all the items
+                self.setItemIndexMethod(index_method)
+            self.update_metrics()
+        return nodes
+
+    def _include_in_rect(self, item):
+        # Once bulk_load() has fixed the scene rect, Qt no longer grows it
+        if self._fixed_rect:
+            self.setSceneRect(self.sceneRect().united(item.sceneBoundingRect()))
+
     def delete_node(self, node):
-        # Remove all edges connected to this node
-        edges_to_remove = node.edges.copy()
-        for edge in edges_to_remove:
-            self.delete_edge(edge)
-        
-        # Remove visual items
-        self.removeItem(node.graphics_item)
-        self.removeItem(node.text_item)
-        
-        # Remove from nodes dictionary
-        del self.nodes[node.id]
-        
-        self.menu_open = False
-        self.update_metrics()
+        with self.batch():
+            # Remove all edges connected to this node
+            edges_to_remove = node.edges.copy()
+            for edge in edges_to_remove:
+                self.delete_edge(edge)
+            
+            # Remove visual item
+            self.removeItem(node.graphics_item)
+            
+            # Remove from nodes dictionary
+            del self.nodes[node.id]
+            self.graph.remove_node(node.id)
+            
+            self.menu_open = False
+            self.update_metrics()
 
     def add_edge(self, source_node, target_node):
         if source_node != target_node:
-            line = self.addLine(source_node.pos.x(), source_node.pos.y(),
-                            target_node.pos.x(), target_node.pos.y())
-            
             edge = Edge(source_node, target_node)
+            line = EdgeItem(edge)
+            self.addItem(line)
             edge.graphics_item = line
             source_node.edges.append(edge)
             target_node.edges.append(edge)
+            self.graph.add_edge(source_node.id, target_node.id)
             
             self.update_metrics()
             return edge
@@ -80,6 +217,7 @@ class GraphScene(QGraphicsScene):
         # Remove edge from both nodes
         if edge in edge.source.edges:
             edge.source.edges.remove(edge)
+            self.graph.remove_edge(edge.source.id, edge.target.id)
         if edge in edge.target.edges:
             edge.target.edges.remove(edge)
         
@@ -112,8 +250,8 @@ class GraphScene(QGraphicsScene):
                 # Check if we clicked on a node
                 items = self.items(pos)
                 for item in items:
-                    if isinstance(item, type(self.addEllipse(0,0,0,0))):
-                        self.moving_node = self.find_node_by_item(item)
+                    if isinstance(item, NodeItem):
+                        self.moving_node = item.node
                         break
                 
     def mouseReleaseEvent(self, event):
@@ -123,6 +261,9 @@ class GraphScene(QGraphicsScene):
                 for view in self.views():
                     view.setDragMode(QGraphicsView.DragMode.NoDrag)
             elif self.mode == "move_node":
+                if self.moving_node is not None:
+                    # Show the final position without waiting for the next tick
+                    self.flush_refresh()
                 self.moving_node = None
         
     def mouseMoveEvent(self, event):
@@ -139,8 +280,8 @@ class GraphScene(QGraphicsScene):
             # Update node position
             pos = event.scenePos()
             self.moving_node.pos = pos
-            self.moving_node.graphics_item.setRect(pos.x() - self.moving_node.radius, pos.y() - self.moving_node.radius, self.moving_node.radius * 2, self.moving_node.radius * 2)
-            self.moving_node.text_item.setPos(pos.x() - self.moving_node.radius / 2, pos.y() - self.moving_node.radius / 2)
+            self.moving_node.graphics_item.set_center(pos)
+            self._include_in_rect(self.moving_node.graphics_item)
             
             # Update connected edges
             for edge in self.moving_node.edges:
@@ -150,7 +291,9 @@ class GraphScene(QGraphicsScene):
                 else:
                     edge.graphics_item.setLine(edge.source.pos.x(), edge.source.pos.y(),
                                             pos.x(), pos.y())
-            self.update_metrics()
+            # Flushed once on release; regenerating the code preview every
+            # frame would stall the drag on large graphs
+            self._geometry_dirty = True
 
     def handle_right_click(self, event):
         pos = event.scenePos()
@@ -160,7 +303,7 @@ class GraphScene(QGraphicsScene):
         has_items = False
         
         for item in items:
-            if isinstance(item, type(self.addEllipse(0,0,0,0))):
+            if isinstance(item, NodeItem):
                 has_items = True
                 node = self.find_node_by_item(item)
                 if node:
@@ -178,7 +321,7 @@ class GraphScene(QGraphicsScene):
                     
                     break
             
-            elif isinstance(item, type(self.addLine(0,0,0,0))):
+            elif isinstance(item, EdgeItem):
                 has_items = True
                 edge = self.find_edge_by_item(item)
                 if edge:
@@ -207,21 +350,21 @@ class GraphScene(QGraphicsScene):
             node.color = color
             node.graphics_item.setBrush(color)
             self.menu_open = False
-            self.update_metrics()
+            self.update_metrics(topology=False)
     
     def change_edge_color(self, edge):
         color = QColorDialog.getColor()
         if color.isValid():
             edge.graphics_item.setPen(QPen(color))
             self.menu_open = False
-            self.update_metrics()
+            self.update_metrics(topology=False)
     
     def change_label_color(self, node):
         color = QColorDialog.getColor()
         if color.isValid():
-            node.text_item.setDefaultTextColor(color)
+            node.graphics_item.set_label_color(color)
             self.menu_open = False
-            self.update_metrics()
+            self.update_metrics(topology=False)
 
     def change_edge_thickness(self, edge):
         value, ok = QInputDialog.getInt(None, "Change Edge Thickness", "Enter new thickness:", min=1, max=10)
@@ -230,7 +373,7 @@ class GraphScene(QGraphicsScene):
             pen.setWidth(value)
             edge.graphics_item.setPen(pen)
             self.menu_open = False
-            self.update_metrics()
+            self.update_metrics(topology=False)
 
     def change_node_size(self, node):
         radius, ok = QInputDialog.getInt(
@@ -243,33 +386,15 @@ class GraphScene(QGraphicsScene):
         )
 
         if ok:
-            node.radius = radius
-            x = node.pos.x() - radius
-            y = node.pos.y() - radius
-            width = height = 2 * radius
-
-            node.graphics_item.setRect(x, y, width, height)
-
-            font = node.text_item.font()
-            font.setPointSize(int(radius / 2))
-            node.text_item.setFont(font)
-
-            text_width = node.text_item.boundingRect().width()  # Larghezza del testo
-            text_height = node.text_item.boundingRect().height()  # Altezza del testo
-            text_x = node.pos.x() - text_width / 2  # Centra orizzontalmente
-            text_y = node.pos.y() - text_height / 2  # Centra verticalmente
-
-            # Aggiorna la posizione dell'etichetta
-            node.text_item.setPos(text_x, text_y)
-
+            node.graphics_item.set_radius(radius)
             self.menu_open = False
-            self.update_metrics()
+            self.update_metrics(topology=False)
 
     def handle_edge_creation(self, pos):
         items = self.items(pos)
         for item in items:
-            if isinstance(item, type(self.addEllipse(0,0,0,0))):
-                clicked_node = self.find_node_by_item(item)
+            if isinstance(item, NodeItem):
+                clicked_node = item.node
                 if clicked_node:
                     if self.selected_node is None:
                         self.selected_node = clicked_node
@@ -279,17 +404,10 @@ class GraphScene(QGraphicsScene):
                         self.selected_node = None
 
     def find_node_by_item(self, item):
-        for node in self.nodes.values():
-            if node.graphics_item == item:
-                return node
-        return None
+        return item.node if isinstance(item, NodeItem) else None
 
     def find_edge_by_item(self, item):
-        for node in self.nodes.values():
-            for edge in node.edges:
-                if edge.graphics_item == item:
-                    return edge
-        return None
+        return item.edge if isinstance(item, EdgeItem) else None
 
 
     def show_color_dialog(self, element_type):
@@ -297,7 +415,7 @@ class GraphScene(QGraphicsScene):
             has_elements = len(self.nodes) > 0
             warning_message = "There are no nodes in the graph. Please add nodes before changing their color."
         elif element_type == "edges":
-            has_elements = any(len(node.edges) > 0 for node in self.nodes.values())
+            has_elements = self.graph.number_of_edges() > 0
             warning_message = "There are no edges in the graph. Please add edges before changing their color."
 
         if not has_elements:
@@ -318,7 +436,7 @@ class GraphScene(QGraphicsScene):
                 self.change_labels_color(color)
 
     def show_thickness_dialog(self):
-        edge_count = sum(len(node.edges) for node in self.nodes.values()) // 2  # Conta gli edge
+        edge_count = self.graph.number_of_edges()
         if edge_count == 0:
             QMessageBox.warning(
                 None,
@@ -358,20 +476,20 @@ class GraphScene(QGraphicsScene):
             node.color = color
             node.graphics_item.setBrush(color)
         self.menu_open = False
-        self.update_metrics()
+        self.update_metrics(topology=False)
 
     def change_edges_color(self, color):
         for node in self.nodes.values():
             for edge in node.edges:
                 edge.graphics_item.setPen(QPen(color))
         self.menu_open = False
-        self.update_metrics()
+        self.update_metrics(topology=False)
 
     def change_labels_color(self, color):
         for node in self.nodes.values():
-            node.text_item.setDefaultTextColor(color)
+            node.graphics_item.set_label_color(color)
         self.menu_open = False
-        self.update_metrics()
+        self.update_metrics(topology=False)
 
     def change_edges_thickness(self, value):
         for node in self.nodes.values():
@@ -380,34 +498,23 @@ class GraphScene(QGraphicsScene):
                 pen.setWidth(value)
                 edge.graphics_item.setPen(pen)
         self.menu_open = False
-        self.update_metrics()
+        self.update_metrics(topology=False)
 
     def change_nodes_size(self, radius):
         for node in self.nodes.values():
-            node.radius = radius
-            x = node.pos.x() - radius
-            y = node.pos.y() - radius
-            width = height = 2 * radius
-
-            node.graphics_item.setRect(x, y, width, height)
-
-            font = node.text_item.font()
-            font.setPointSize(int(radius / 2))
-            node.text_item.setFont(font)
-
-            text_width = node.text_item.boundingRect().width()
-            text_height = node.text_item.boundingRect().height()
-            text_x = node.pos.x() - text_width / 2
-            text_y = node.pos.y() - text_height / 2
-
-            node.text_item.setPos(text_x, text_y)
+            node.graphics_item.set_radius(radius)
 
         self.menu_open = False
-        self.update_metrics()
+        self.update_metrics(topology=False)
 
     def clear_all(self):
         self.clear()
+        if self._fixed_rect:
+            # Back to a scene rect that Qt grows with the items
+            self.setSceneRect(QRectF())
+            self._fixed_rect = False
         self.nodes.clear()
+        self.graph.clear()
         self.node_counter = 0
         self.selected_node = None
         self.update_metrics() 
\ No newline at end of file
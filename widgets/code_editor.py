@@ -1,10 +1,12 @@
 from PyQt6.QtWidgets import (QPlainTextEdit, QWidget, QVBoxLayout, QPushButton, 
-                            QMessageBox, QHBoxLayout, QLabel, QComboBox)
+                            QMessageBox, QHBoxLayout, QLabel, QComboBox, QFileDialog)
 from PyQt6.QtCore import pyqtSignal
+from utils.graph_io import FILE_FILTERS
 
 class CodeEditor(QWidget):
     codeChanged = pyqtSignal(str)
     importRequested = pyqtSignal(str)
+    fileImportRequested = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
@@ -39,6 +41,9 @@ class CodeEditor(QWidget):
         self.import_button = QPushButton("Import Graph from Code")
         self.import_button.clicked.connect(self._on_import_clicked)
         self.layout.addWidget(self.import_button)
+        self.import_file_button = QPushButton("Import Graph from File")
+        self.import_file_button.clicked.connect(self._on_import_file_clicked)
+        self.layout.addWidget(self.import_file_button)
         
         # Internal flags
         self._updating = False
@@ -64,11 +69,13 @@ class CodeEditor(QWidget):
         if mode == "Preview":
             self.editor.setReadOnly(True)
             self.import_button.setVisible(False)
+            self.import_file_button.setVisible(False)
             if not self._updating:
                 self.codeChanged.emit(self.editor.toPlainText())
         else:
             self.editor.setReadOnly(False)
             self.import_button.setVisible(True)
+            self.import_file_button.setVisible(True)
             self.editor.clear()
             self.editor.setPlaceholderText("Paste your graph code here...")
         
@@ -86,4 +93,15 @@ class CodeEditor(QWidget):
             self.importRequested.emit(code)
             self.mode_combo.setCurrentText("Preview")
         except Exception as e:
-            QMessageBox.warning(self, "Import Error", str(e)) 
\ No newline at end of file
+            QMessageBox.warning(self, "Import Error", str(e))
+
+    def _on_import_file_clicked(self):
+        file_name, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import Graph",
+            "",
+            ";;".join(FILE_FILTERS.values()) + ";;All Files (*.*)",
+        )
+        if file_name:
+            self.fileImportRequested.emit(file_name)
+            self.mode_combo.setCurrentText("Preview")
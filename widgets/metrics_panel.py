@@ -1,5 +1,16 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTextEdit, QScrollArea
-import networkx as nx
+import math
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QLineEdit,
+                             QDoubleSpinBox, QSpinBox, QPushButton, QComboBox, QTableView, QHeaderView)
+from PyQt6.QtGui import QFontDatabase
+from utils.metrics_engine import MetricsEngine, DEFAULT_TARGET_ERROR
+from utils.metrics_backends import available_backends, capability_table
+from utils.component_distances import component_summary
+from utils.metric_summaries import top_k, histogram, format_histogram, DEFAULT_TOP_K
+from widgets.metrics_table import MetricsTableModel, COLUMNS, METRIC_COLUMNS
+
+COMPUTING = "computing\u2026"
+# Components listed individually below the distance metrics
+COMPONENT_LIST_LIMIT = 20
 
 class MetricsPanel(QWidget):
     def __init__(self, scene):
@@ -15,6 +26,25 @@ class MetricsPanel(QWidget):
         scroll.setWidgetResizable(True)
         main_layout.addWidget(scroll)
         
+        # Backend selection
+        backend_layout = QHBoxLayout()
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItem("Auto", "auto")
+        for backend in available_backends():
+            self.backend_combo.addItem(backend.label, backend.name)
+        self.backend_combo.setToolTip(
+            "Preferred library for computing metrics\n"
+            "Metrics it does not implement fall back to the fastest available one\n\n"
+            + "\n".join(f"{label}: {', '.join(metrics)}" for label, metrics in capability_table().items())
+        )
+        self.backend_combo.currentIndexChanged.connect(lambda: self.update_metrics())
+        self.backend_label = QLabel("")
+        backend_layout.addWidget(QLabel("Backend:"))
+        backend_layout.addWidget(self.backend_combo)
+        backend_layout.addWidget(self.backend_label)
+        backend_layout.addStretch()
+        main_layout.insertLayout(0, backend_layout)
+        
         # Create container widget for scroll area
         container = QWidget()
         scroll.setWidget(container)
@@ -25,6 +55,7 @@ class MetricsPanel(QWidget):
         self.edges_label = QLabel("Edges: 0")
         self.density_label = QLabel("Density: 0")
         self.avg_degree_label = QLabel("Average Degree: 0")
+        self.components_label = QLabel("Connected Components: 0")
         
         # Advanced metrics
         self.clustering_label = QLabel("Average Clustering: N/A")
@@ -32,12 +63,22 @@ class MetricsPanel(QWidget):
         self.radius_label = QLabel("Radius: N/A")
         self.center_nodes_label = QLabel("Center Nodes: N/A")
         self.periphery_nodes_label = QLabel("Periphery Nodes: N/A")
+        self.components_distances_label = QLabel("")
+        self.components_distances_label.setVisible(False)
         
-        # Centrality metrics
-        self.degree_centrality_label = QLabel("Degree Centrality:")
-        self.betweenness_centrality_label = QLabel("Betweenness Centrality:")
-        self.closeness_centrality_label = QLabel("Closeness Centrality:")
-        self.eigenvector_centrality_label = QLabel("Eigenvector Centrality:")
+        # Per-node degrees and centralities; the table only formats visible rows
+        self.table_model = MetricsTableModel(self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.table_model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.horizontalHeader().setSortIndicatorShown(True)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.setMinimumHeight(300)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter nodes\u2026")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(self.table_model.set_filter)
         
         # Add all labels to layout
         self.layout.addWidget(QLabel("Basic Metrics:"))
@@ -45,6 +86,7 @@ class MetricsPanel(QWidget):
         self.layout.addWidget(self.edges_label)
         self.layout.addWidget(self.density_label)
         self.layout.addWidget(self.avg_degree_label)
+        self.layout.addWidget(self.components_label)
         
         self.layout.addWidget(QLabel("\nAdvanced Metrics:"))
         self.layout.addWidget(self.clustering_label)
@@ -52,30 +94,79 @@ class MetricsPanel(QWidget):
         self.layout.addWidget(self.radius_label)
         self.layout.addWidget(self.center_nodes_label)
         self.layout.addWidget(self.periphery_nodes_label)
+        self.layout.addWidget(self.components_distances_label)
+        
+        self.layout.addWidget(QLabel("\nNode Metrics:"))
         
-        self.layout.addWidget(QLabel("\nCentrality Metrics:"))
-        self.layout.addWidget(self.degree_centrality_label)
-        self.layout.addWidget(self.betweenness_centrality_label)
-        self.layout.addWidget(self.closeness_centrality_label)
-        self.layout.addWidget(self.eigenvector_centrality_label)
+        # Accuracy controls for sampled betweenness/closeness on large graphs
+        accuracy_layout = QHBoxLayout()
+        self.target_error_spin = QDoubleSpinBox()
+        self.target_error_spin.setRange(0.01, 0.5)
+        self.target_error_spin.setSingleStep(0.01)
+        self.target_error_spin.setValue(DEFAULT_TARGET_ERROR)
+        self.target_error_spin.setToolTip(
+            "Target error of approximate betweenness and closeness\nSmaller values sample more nodes"
+        )
+        self.target_error_spin.editingFinished.connect(self.update_metrics)
+        self.exact_button = QPushButton("Compute Exact Values")
+        self.exact_button.setEnabled(False)
+        self.exact_button.clicked.connect(lambda: self.update_metrics(exact=True))
+        accuracy_layout.addWidget(QLabel("Target error:"))
+        accuracy_layout.addWidget(self.target_error_spin)
+        accuracy_layout.addWidget(self.exact_button)
+        accuracy_layout.addStretch()
+        self.layout.addLayout(accuracy_layout)
         
-        # Node degrees
-        self.layout.addWidget(QLabel("\nNode Degrees:"))
-        self.degrees_text = QTextEdit()
-        self.degrees_text.setReadOnly(True)
-        self.degrees_text.setMaximumHeight(200)
-        self.degrees_text.setMinimumHeight(100)
-        self.layout.addWidget(self.degrees_text)
-        self.layout.addStretch()
+        self.layout.addWidget(self.filter_edit)
+        self.layout.addWidget(self.table_view)
         
+        # Most central nodes and value distribution of one metric at a time
+        self.layout.addWidget(QLabel("\nTop Nodes and Distribution:"))
+        summary_layout = QHBoxLayout()
+        self.summary_combo = QComboBox()
+        for name, title in COLUMNS[1:]:
+            self.summary_combo.addItem(title, name)
+        self.summary_combo.currentIndexChanged.connect(self._update_summary)
+        self.top_k_spin = QSpinBox()
+        self.top_k_spin.setRange(1, 100)
+        self.top_k_spin.setValue(DEFAULT_TOP_K)
+        self.top_k_spin.valueChanged.connect(self._update_summary)
+        summary_layout.addWidget(QLabel("Metric:"))
+        summary_layout.addWidget(self.summary_combo)
+        summary_layout.addWidget(QLabel("Top:"))
+        summary_layout.addWidget(self.top_k_spin)
+        summary_layout.addStretch()
+        self.layout.addLayout(summary_layout)
+        self.top_nodes_label = QLabel("")
+        self.histogram_label = QLabel("")
+        self.histogram_label.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.layout.addWidget(self.top_nodes_label)
+        self.layout.addWidget(self.histogram_label)
         
-    def update_metrics(self):
-        num_nodes = len(self.scene.nodes)
-        num_edges = sum(len(node.edges) for node in self.scene.nodes.values()) // 2
+        # Advanced metrics are computed off the GUI thread
+        self.pivots = None  # Sample size of the displayed centralities, None when exact
+        self.num_components = 0
+        self.submitted_topology = None
+        self.component_distances = None  # (topology key, per-component distances) of the last result
+        self.engine = MetricsEngine(self)
+        self.engine.metricReady.connect(self._on_metric_ready)
+        self.engine.computationFailed.connect(self._on_metrics_failed)
+        
+    def update_metrics(self, exact=False):
+        snapshot = self.scene.graph.snapshot()
+        num_nodes = snapshot.num_nodes
+        num_edges = snapshot.num_edges
+        # Maintained incrementally by the graph model, so this costs nothing
+        self.num_components = self.scene.graph.number_of_components()
         
         # Update basic metrics
         self.nodes_label.setText(f"Nodes: {num_nodes}")
         self.edges_label.setText(f"Edges: {num_edges}")
+        if self.num_components > 1:
+            self.components_label.setText(
+                f"Connected Components: {self.num_components} (largest: {len(snapshot.components[0])} nodes)")
+        else:
+            self.components_label.setText(f"Connected Components: {self.num_components}")
         
         if num_nodes > 1:
             density = (2 * num_edges) / (num_nodes * (num_nodes - 1))
@@ -87,79 +178,101 @@ class MetricsPanel(QWidget):
             avg_degree = (2 * num_edges) / num_nodes
             self.avg_degree_label.setText(f"Average Degree: {avg_degree:.2f}")
             
-            # Create NetworkX graph for advanced metrics
-            G = nx.Graph()
-            
-            # Add nodes and edges
-            for node in self.scene.nodes.values():
-                G.add_node(node.id)
+            # Triangle counts are maintained incrementally by the graph model
+            self.clustering_label.setText(f"Average Clustering: {self.scene.graph.average_clustering():.3f}")
+            self.diameter_label.setText(f"Diameter: {COMPUTING}")
+            self.radius_label.setText(f"Radius: {COMPUTING}")
+            self.center_nodes_label.setText(f"Center Nodes: {COMPUTING}")
+            self.periphery_nodes_label.setText(f"Periphery Nodes: {COMPUTING}")
+            for label in (self.diameter_label, self.radius_label, self.center_nodes_label, self.periphery_nodes_label):
+                label.setToolTip("")
+            self.components_distances_label.setVisible(False)
+            self.table_model.set_nodes(snapshot.nodes, snapshot.degrees)
+            self._update_summary()
             
-            added_edges = set()
-            for node in self.scene.nodes.values():
-                for edge in node.edges:
-                    edge_tuple = tuple(sorted([edge.source.id, edge.target.id]))
-                    if edge_tuple not in added_edges:
-                        G.add_edge(edge.source.id, edge.target.id)
-                        added_edges.add(edge_tuple)
-            
-            try:
-                # Calculate advanced metrics
-                clustering = nx.average_clustering(G)
-                self.clustering_label.setText(f"Average Clustering: {clustering:.3f}")
-                
-                if nx.is_connected(G):
-                    diameter = nx.diameter(G)
-                    radius = nx.radius(G)
-                    center = nx.center(G)
-                    periphery = nx.periphery(G)
-                    
-                    self.diameter_label.setText(f"Diameter: {diameter}")
-                    self.radius_label.setText(f"Radius: {radius}")
-                    self.center_nodes_label.setText(f"Center Nodes: {', '.join(center)}")
-                    self.periphery_nodes_label.setText(f"Periphery Nodes: {', '.join(periphery)}")
-                else:
-                    self.diameter_label.setText("Diameter: N/A (Graph not connected)")
-                    self.radius_label.setText("Radius: N/A (Graph not connected)")
-                    self.center_nodes_label.setText("Center Nodes: N/A (Graph not connected)")
-                    self.periphery_nodes_label.setText("Periphery Nodes: N/A (Graph not connected)")
-                
-                # Calculate centrality metrics
-                degree_cent = nx.degree_centrality(G)
-                betweenness_cent = nx.betweenness_centrality(G)
-                closeness_cent = nx.closeness_centrality(G)
-                try:
-                    eigenvector_cent = nx.eigenvector_centrality(G)
-                except:
-                    eigenvector_cent = {node: 0 for node in G.nodes()}
-                
-                # Format centrality metrics
-                self.degree_centrality_label.setText("Degree Centrality:\n" + 
-                    "\n".join(f"{node}: {cent:.3f}" for node, cent in degree_cent.items()))
-                self.betweenness_centrality_label.setText("Betweenness Centrality:\n" + 
-                    "\n".join(f"{node}: {cent:.3f}" for node, cent in betweenness_cent.items()))
-                self.closeness_centrality_label.setText("Closeness Centrality:\n" + 
-                    "\n".join(f"{node}: {cent:.3f}" for node, cent in closeness_cent.items()))
-                self.eigenvector_centrality_label.setText("Eigenvector Centrality:\n" + 
-                    "\n".join(f"{node}: {cent:.3f}" for node, cent in eigenvector_cent.items()))
-                
-            except Exception as e:
-                print(f"Error calculating advanced metrics: {e}")
-            
-            # Update node degrees text
-            degrees_text = ""
-            for node_id, node in self.scene.nodes.items():
-                degree = len(node.edges)
-                degrees_text += f"{node_id}: {degree}\n"
-            self.degrees_text.setText(degrees_text)
+            self.submitted_topology = snapshot.topology_key
+            self.engine.submit(
+                snapshot,
+                exact=exact,
+                target_error=self.target_error_spin.value(),
+                backend=self.backend_combo.currentData(),
+            )
         else:
+            self.engine.cancel()
+            self.exact_button.setEnabled(False)
+            self.backend_label.setText("")
             self.avg_degree_label.setText("Average Degree: N/A")
             self.clustering_label.setText("Average Clustering: N/A")
             self.diameter_label.setText("Diameter: N/A")
             self.radius_label.setText("Radius: N/A")
             self.center_nodes_label.setText("Center Nodes: N/A")
             self.periphery_nodes_label.setText("Periphery Nodes: N/A")
-            self.degree_centrality_label.setText("Degree Centrality: N/A")
-            self.betweenness_centrality_label.setText("Betweenness Centrality: N/A")
-            self.closeness_centrality_label.setText("Closeness Centrality: N/A")
-            self.eigenvector_centrality_label.setText("Eigenvector Centrality: N/A")
-            self.degrees_text.setText("") 
\ No newline at end of file
+            self.components_distances_label.setVisible(False)
+            self.table_model.set_nodes((), (), pending=False)
+            self._update_summary()
+
+    def _on_metric_ready(self, version, name, value):
+        if name == "sampling":
+            self.pivots = value
+            self.exact_button.setEnabled(value is not None)
+            suffix = "" if value is None else " (approx.)"
+            self.table_model.set_header("betweenness_centrality", "Betweenness" + suffix)
+            self.table_model.set_header("closeness_centrality", "Closeness" + suffix)
+            self.table_view.horizontalHeader().setToolTip(
+                "" if value is None else f"Betweenness and closeness are estimated from {value} sampled nodes")
+        elif name == "backends":
+            labels = list(dict.fromkeys(value.values()))
+            self.backend_label.setText(f"(using {', '.join(labels)})")
+            self.backend_label.setToolTip("\n".join(f"{metric}: {label}" for metric, label in value.items()))
+        elif name == "distances":
+            self.component_distances = (self.submitted_topology, value)
+            # The main labels describe the largest component
+            largest = value[0]
+            suffix = "" if len(value) == 1 else f" (largest component, {largest['size']} nodes)"
+            self.diameter_label.setText(f"Diameter: {largest['diameter']}{suffix}")
+            self.radius_label.setText(f"Radius: {largest['radius']}{suffix}")
+            self.center_nodes_label.setText(f"Center Nodes: {', '.join(largest['center'])}{suffix}")
+            self.periphery_nodes_label.setText(f"Periphery Nodes: {', '.join(largest['periphery'])}{suffix}")
+            if len(value) > 1:
+                lines = [f"{i}. {component_summary(extrema)}"
+                         for i, extrema in enumerate(value[:COMPONENT_LIST_LIMIT], start=1)]
+                if len(value) > COMPONENT_LIST_LIMIT:
+                    lines.append(f"\u2026 and {len(value) - COMPONENT_LIST_LIMIT} more components")
+                self.components_distances_label.setText("Per Component:\n" + "\n".join(lines))
+            self.components_distances_label.setVisible(len(value) > 1)
+        elif name in METRIC_COLUMNS:
+            self.table_model.set_metric(name, value)
+            if name == self.summary_combo.currentData():
+                self._update_summary()
+
+    def _update_summary(self):
+        name = self.summary_combo.currentData()
+        nodes = self.table_model.nodes()
+        values = self.table_model.values(name)
+        if not nodes:
+            self.top_nodes_label.setText("Top Nodes: N/A")
+            self.histogram_label.setText("")
+            return
+        if values is None:
+            self.top_nodes_label.setText(f"Top Nodes: {COMPUTING}")
+            self.histogram_label.setText("")
+            return
+        if all(math.isnan(value) for value in values):
+            # Cleared by a failed computation
+            self.top_nodes_label.setText("Top Nodes: N/A")
+            self.histogram_label.setText("")
+            return
+        precision = 0 if name == "degree" else 3
+        self.top_nodes_label.setText("Top Nodes:\n" + "\n".join(
+            f"{node}: {value:.{precision}f}" for node, value in top_k(nodes, values, self.top_k_spin.value())))
+        self.histogram_label.setText("Distribution:\n" + "\n".join(format_histogram(*histogram(values, discrete=name == "degree"), name == "degree")))
+
+    def _on_metrics_failed(self, version, message):
+        print(f"Error calculating advanced metrics: {message}")
+        # Results that did arrive stay; everything still computing becomes N/A
+        for label in (self.diameter_label, self.radius_label, self.center_nodes_label, self.periphery_nodes_label):
+            if label.text().endswith(COMPUTING):
+                label.setText(label.text().replace(COMPUTING, "N/A (computation failed)"))
+                label.setToolTip(message)
+        self.table_model.clear_pending()
+        self._update_summary()
@@ -0,0 +1,167 @@
+import math
+import re
+from array import array
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+# (metric name, header) per column; the first column holds the node ids
+COLUMNS = (
+    ("node", "Node"),
+    ("degree", "Degree"),
+    ("degree_centrality", "Degree Centrality"),
+    ("betweenness_centrality", "Betweenness"),
+    ("closeness_centrality", "Closeness"),
+    ("eigenvector_centrality", "Eigenvector"),
+)
+METRIC_COLUMNS = tuple(name for name, _ in COLUMNS[2:])
+# Rows handed to the view per fetchMore() call
+FETCH_BATCH = 256
+_DIGITS = re.compile(r"(\d+)")
+
+
+def _natural_key(node_id):
+    # "n2" before "n10": digit runs compare as numbers
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in _DIGITS.split(str(node_id)) if part]
+
+
+class MetricsTableModel(QAbstractTableModel):
+    """Per-node metrics stored column-wise in flat arrays.
+
+    Only the cells the view asks for are ever formatted, and rows are
+    exposed in batches through canFetchMore()/fetchMore(), so the cost of
+    showing a result does not grow with the number of nodes. Sorting and
+    filtering work on a permutation of row indices, never on the values.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._nodes = ()
+        self._values = {"degree": array("q")}
+        self._pending = set()  # Metric columns still being computed
+        self._headers = {name: title for name, title in COLUMNS}
+        self._order = []  # Row indices in display order, after filtering and sorting
+        self._loaded = 0  # Rows of _order exposed to the view so far
+        self._sort_column = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._filter = ""
+
+    def set_nodes(self, nodes, degrees, pending=True):
+        """Start a new result for ``nodes``; metric columns show as computing until set."""
+        self.beginResetModel()
+        self._nodes = nodes
+        self._values = {"degree": array("q", degrees)}
+        for name in METRIC_COLUMNS:
+            self._values[name] = array("d", bytes(8 * len(nodes)))
+        self._pending = set(METRIC_COLUMNS) if pending else set()
+        self._rebuild_order()
+        self.endResetModel()
+
+    def set_metric(self, name, values):
+        """Store a metric given as a dict keyed by node id."""
+        if name not in self._values:
+            return
+        self._values[name] = array("d", (values[node_id] for node_id in self._nodes))
+        self._pending.discard(name)
+        column = self._column_of(name)
+        if column == self._sort_column:
+            self.beginResetModel()
+            self._rebuild_order()
+            self.endResetModel()
+        elif self._loaded:
+            self.dataChanged.emit(self.index(0, column), self.index(self._loaded - 1, column))
+
+    def clear_pending(self):
+        """Show the metric columns still computing as N/A, after a failed computation."""
+        for name in self._pending:
+            self._values[name] = array("d", [math.nan]) * len(self._nodes)
+        self._pending.clear()
+        if self._loaded:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._loaded - 1, len(COLUMNS) - 1))
+
+    def values(self, name):
+        """Array of a metric aligned with nodes(), or None while it is computing."""
+        return None if name in self._pending else self._values.get(name)
+
+    def nodes(self):
+        return self._nodes
+
+    def set_header(self, name, title):
+        column = self._column_of(name)
+        self._headers[name] = title
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, column, column)
+
+    def set_filter(self, text):
+        """Show only nodes whose id contains ``text``, case-insensitively."""
+        self.beginResetModel()
+        self._filter = text.strip().lower()
+        self._rebuild_order()
+        self.endResetModel()
+
+    def _column_of(self, name):
+        return next(i for i, (column_name, _) in enumerate(COLUMNS) if column_name == name)
+
+    def _rebuild_order(self):
+        if self._filter:
+            order = [i for i, node_id in enumerate(self._nodes) if self._filter in str(node_id).lower()]
+        else:
+            order = list(range(len(self._nodes)))
+        if self._sort_column is not None:
+            name = COLUMNS[self._sort_column][0]
+            if name == "node":
+                key = lambda i: _natural_key(self._nodes[i])
+            else:
+                values = self._values[name]
+                # NaN sorts last instead of breaking the comparison
+                key = lambda i: (math.isnan(values[i]), values[i])
+            order.sort(key=key, reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+        self._order = order
+        self._loaded = min(len(order), FETCH_BATCH)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._loaded < len(self._order)
+
+    def fetchMore(self, parent):
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH, len(self._order) - self._loaded)
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        name = COLUMNS[index.column()][0]
+        if role == Qt.ItemDataRole.TextAlignmentRole and name != "node":
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        row = self._order[index.row()]
+        if name == "node":
+            return str(self._nodes[row])
+        if name in self._pending:
+            return "…"
+        value = self._values[name][row]
+        if name == "degree":
+            return str(value)
+        return "N/A" if math.isnan(value) else f"{value:.3f}"
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[COLUMNS[section][0]]
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        # A reset rather than a layout change, since only the first batch of
+        # the new order is exposed to the view
+        self.beginResetModel()
+        self._sort_column = column
+        self._sort_order = order
+        self._rebuild_order()
+        self.endResetModel()